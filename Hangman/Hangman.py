@@ -1,8 +1,9 @@
-import pandas as pd
-import numpy as np
+import heapq
 import json
 import random
 
+from word_index import load_word_index
+
 
 # Step 1: Load the word list from the text file and preprocess it into a dictionary
 def load_words(file_path="words.txt"):
@@ -53,85 +54,312 @@ def save_word_length_dict_to_json(dict_len_word, output_path="words.json"):
 
 
 # Step 3: Hangman game logic
-def hangman_game(l, dict_len_word):
+class HumanGuesser:
+    """
+    Guesser asking the letters to the player. Any object with the same methods can play instead,
+    see hangman_solver.FrequencyGuesser.
+    """
+
+    def start(self, length):
+        """Called before the first guess, with the length of the word to guess."""
+
+    def next_letter(self):
+        return input("Enter a letter: ").lower()
+
+    def update(self, letter, positions):
+        """Called after each guess with the bitmask of the positions revealed, 0 for a miss."""
+
+
+# Letter -> its bit in the mask of the letters guessed
+LETTER_BITS = {letter: 1 << i for i, letter in enumerate("abcdefghijklmnopqrstuvwxyz")}
+
+
+class WordHost:
+    """
+    Host of a game on a word chosen in advance.
+    """
+
+    def __init__(self, chosen_word):
+        self.chosen_word = chosen_word
+        self.length = len(chosen_word)
+        # Letter -> bitmask of its positions in the word, so each guess is a single lookup
+        self.positions = {}
+        for i, letter in enumerate(chosen_word):
+            self.positions[letter] = self.positions.get(letter, 0) | 1 << i
+        # Other characters (e.g. '-') can not be guessed, they are shown from the start
+        self.shown = {
+            character: positions
+            for character, positions in self.positions.items()
+            if character not in LETTER_BITS
+        }
+
+    def reveal(self, letter):
+        """
+        Args:
+            letter (str): The letter guessed.
+
+        Returns:
+            int: Bitmask of the positions of the letter in the word, 0 for a miss.
+        """
+        if letter not in LETTER_BITS:
+            return 0
+        return self.positions.get(letter, 0)
+
+    def word(self):
+        return self.chosen_word
+
+
+# Message shown after each kind of guess, see GameState.guess
+MESSAGES = {
+    "hit": "Well done! You found a letter!",
+    "miss": "Wrong answer!",
+    "repeat": "You already tried this letter!",
+    "invalid": "Please enter a single letter!",
+}
+
+
+def word_state(l, hits):
+    """
+    Args:
+        l (int): The length of the word.
+        hits (dict): Letter -> bitmask of the positions where it was revealed.
+
+    Returns:
+        str: The word with underscores for unguessed letters, e.g. '_ a _ _ a'.
+    """
+    guessed_word = ["_"] * l
+    for letter, positions in hits.items():
+        for i in range(l):
+            if positions >> i & 1:
+                guessed_word[i] = letter
+    return " ".join(guessed_word)
+
+
+class GameState:
+    """
+    State of one game, held in bitmasks: the positions revealed, and the letters already guessed
+    (one bit per letter), so a guess, the win check and the repeated-guess check are
+    constant-time bit operations. Shared by play_hangman and the server of hangman_server.
+    """
+
+    __slots__ = ("host", "chances", "misses", "score", "revealed", "guessed", "hits")
+
+    def __init__(self, host):
+        """
+        Args:
+            host: Answers the guesses, a WordHost or an evil_hangman.EvilHost.
+        """
+        self.host = host
+        self.chances = (
+            host.length // 2 + 1
+        )  # Number of chances depends on the word length
+        self.misses = 0  # Counter for mistakes
+        self.score = 0
+        # Letter -> positions revealed, the other characters (e.g. '-') are shown from the start
+        self.hits = dict(host.shown)
+        self.revealed = 0  # Bit i set once position i is revealed
+        for positions in self.hits.values():
+            self.revealed |= positions
+        self.guessed = 0  # Bit of each letter already guessed, see LETTER_BITS
+
+    def chances_left(self):
+        return self.chances - self.misses
+
+    def won(self):
+        return self.revealed == (1 << self.host.length) - 1
+
+    def over(self):
+        return self.won() or self.misses >= self.chances
+
+    def state(self):
+        """
+        Returns:
+            str: The word with underscores for unguessed letters, e.g. '_ a _ _ a'.
+        """
+        return word_state(self.host.length, self.hits)
+
+    def guess(self, letter):
+        """
+        Plays a letter. Anything else than a single letter, or a letter guessed again, is ignored
+        without costing a chance.
+
+        Args:
+            letter (str): The letter guessed.
+
+        Returns:
+            str: 'hit', 'miss', 'repeat' for a letter already guessed or 'invalid'.
+        """
+        bit = LETTER_BITS.get(letter)
+        if bit is None:
+            return "invalid"
+        if self.guessed & bit:
+            return "repeat"
+        self.guessed |= bit
+
+        # Check if the guessed letter is in the word
+        positions = self.host.reveal(letter)
+        if not positions:
+            self.misses += 1
+            self.score -= 1  # Deduct points for incorrect guesses
+            return "miss"
+        # Update the revealed positions and earn points for each correct letter
+        self.revealed |= positions
+        self.hits[letter] = positions
+        self.score += 2 * positions.bit_count()
+        return "hit"
+
+
+def play_hangman(host, guesser, verbose=True):
+    """
+    Plays one game of Hangman, with the rules of GameState. The characters that are not letters
+    (e.g. '-') are shown from the start.
+
+    Args:
+        host: Answers the guesses, a WordHost or an evil_hangman.EvilHost.
+        guesser: The player, see HumanGuesser.
+        verbose (bool): False to play without printing anything.
+
+    Returns:
+        int: The player's score after the game.
+        int: The number of wrong guesses.
+        bool: True if the word was found.
+    """
+    guesser.start(host.length)
+    game = GameState(host)
+
+    # Start the game loop
+    while not game.over():
+        # Show current status
+        if verbose:
+            print(f"\nYou have {game.chances_left()} chances left.")
+            print("Current word:", game.state())
+        letter = guesser.next_letter()
+
+        result = game.guess(letter)
+        if verbose:
+            print(MESSAGES[result])
+        if result in ("hit", "miss"):
+            guesser.update(letter, game.hits.get(letter, 0))
+
+    won = game.won()
+
+    # Show final results
+    if verbose:
+        print(f"\nThe word was: {host.word()}")
+
+        if won:
+            print(f"Congratulations! You won with {game.score} points.")
+        else:
+            print(f"Sorry, you lost. Your score is {game.score} points.")
+
+    return game.score, game.misses, won
+
+
+def hangman_game(
+    l, dict_len_word, guesser=None, verbose=True, evil=False, difficulty=None
+):
     """
     Main logic for the Hangman game. Players attempt to guess a word based on its length.
 
     Args:
         l (int): The length of the word the player wants to guess.
         dict_len_word (dict): A dictionary where keys are word lengths and values are word lists.
+        guesser: The player, defaults to a HumanGuesser asking the letters with input().
+        verbose (bool): False to play without printing anything, e.g. for simulations.
+        evil (bool): True for the adversarial mode, where the word is never chosen in advance
+            and dodges the guesses (see evil_hangman).
+        difficulty (str): 'easy', 'medium' or 'hard' to pick the word within this difficulty
+            band (see word_difficulty), None for any word. The scores only cover words.txt.
 
     Returns:
         int: The player's score after the game.
+
+    Raises:
+        ValueError: If a difficulty is given and dict_len_word is not the index of words.txt,
+            or in the evil mode if no word of the length is made only of letters.
     """
+    if guesser is None:
+        guesser = HumanGuesser()
+
     # Ensure the chosen length exists in the dictionary
     while l not in dict_len_word:
+        if not isinstance(guesser, HumanGuesser):
+            raise ValueError(f"No words of length {l}")
         l = int(
             input("Error! No words of this length. Please enter a valid word length: ")
         )
 
-    # Choose a random word of the given length
     choice_list = dict_len_word[l]
-    chosen_word = random.choice(choice_list)
-
-    # Initialize game variables
-    score = 0
-    chances = l // 2 + 1  # Number of chances equals the word length
-    cpt = 0  # Counter for mistakes
-    guessed_word = ["_"] * l  # Word state with underscores for unguessed letters
-
-    # Start the game loop
-    while cpt < chances:
-        if guessed_word == list(chosen_word):  # Player won
-            break
-
-        # Show current status
-        print(f"\nYou have {chances-cpt} chances left.")
-        print("Current word:", " ".join(guessed_word))
-        letter = input("Enter a letter: ").lower()
-
-        # Check if the guessed letter is in the chosen word
-        if letter in chosen_word:
-            # Update the guessed word and increment score
-            for i in range(len(chosen_word)):
-                if chosen_word[i] == letter:
-                    guessed_word[i] = letter
-                    score += 2  # Earn points for each correct letter
-            print("Well done! You found a letter!")
-        else:
-            # Incorrect guess
-            cpt += 1
-            score -= 1  # Deduct points for incorrect guesses
-            print("Wrong answer!")
+    if evil:
+        from evil_hangman import EvilHost  # NumPy is only loaded for this mode
 
-    # Show final results
-    print(f"\nThe word was: {chosen_word}")
+        host = EvilHost(choice_list)
+    elif difficulty:
+        from word_difficulty import sampler_for  # Scores loaded on first use
 
-    if guessed_word == list(chosen_word):
-        print(f"Congratulations! You won with {score} points.")
+        host = WordHost(sampler_for(dict_len_word).sample(l, difficulty))
     else:
-        print(f"Sorry, you lost. Your score is {score} points.")
+        # Choose a random word of the given length
+        host = WordHost(random.choice(choice_list))
 
+    score, _, _ = play_hangman(host, guesser, verbose)
     return score
 
 
 # Step 4: Function to track the scores of multiple players
-def hangman_game_score(l, dict_len_word):
+def hangman_game_score(l, dict_len_word, evil=False, difficulty=None):
     """
     A variant of the Hangman game that only returns the score instead of interactive play.
 
     Args:
         l (int): The length of the word the player wants to guess.
         dict_len_word (dict): A dictionary of word lengths to word lists.
+        evil (bool): True for the adversarial mode, see hangman_game.
+        difficulty (str): The difficulty band of the word, see hangman_game.
 
     Returns:
         int: The player's score after the game.
     """
-    return hangman_game(l, dict_len_word)
+    return hangman_game(l, dict_len_word, evil=evil, difficulty=difficulty)
 
 
 # Step 5: Multiplayer function to manage multiple players and games
-def multiplayer_hangman(nb_players, nb_words, dict_len_word):
+class Leaderboard:
+    """
+    Total score of each player, updated after each game.
+    """
+
+    def __init__(self):
+        self.scores = {}  # Player -> total score, in order of arrival
+
+    def add(self, player, score):
+        self.scores[player] = self.scores.get(player, 0) + score
+
+    def top(self, n=None):
+        """
+        Args:
+            n (int): Number of players returned, None for all.
+
+        Returns:
+            list: (player, total score) pairs, best first.
+        """
+        if n is None:
+            return sorted(self.scores.items(), key=lambda item: -item[1])
+        return heapq.nlargest(n, self.scores.items(), key=lambda item: item[1])
+
+    def __getitem__(self, player):
+        return self.scores[player]
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __str__(self):
+        return "\n".join(f"{player}: {score} points" for player, score in self.top())
+
+
+def multiplayer_hangman(
+    nb_players, nb_words, dict_len_word, evil=False, difficulty=None
+):
     """
     Manages the multiplayer aspect of the Hangman game.
 
@@ -139,45 +367,59 @@ def multiplayer_hangman(nb_players, nb_words, dict_len_word):
         nb_players (int): The number of players.
         nb_words (int): The number of rounds each player will play.
         dict_len_word (dict): The dictionary of words categorized by length.
+        evil (bool): True for the adversarial mode, see hangman_game.
+        difficulty (str): The difficulty band of the words, see hangman_game.
 
     Returns:
-        pd.Series: A Pandas Series with player numbers as indices and total scores as values.
+        Leaderboard: The total score of each player ('Player 1', 'Player 2', ...).
     """
-    players_scores = []  # List to store total scores for each player
+    leaderboard = Leaderboard()
 
     # Loop through each player
     for player_num in range(1, nb_players + 1):
         print(f"\n--- Player {player_num}'s turn ---")
-        total_score = 0
+        leaderboard.add(f"Player {player_num}", 0)
 
         # Loop through each round for the player
         for round_num in range(1, nb_words + 1):
             print(f"\nRound {round_num} - Player {player_num}:")
             word_length = int(input("Enter the length of the word you want to guess: "))
-            total_score += hangman_game_score(word_length, dict_len_word)
-
-        players_scores.append(total_score)
+            leaderboard.add(
+                f"Player {player_num}",
+                hangman_game_score(word_length, dict_len_word, evil, difficulty),
+            )
 
-    # Create a DataFrame to summarize the scores
-    players = [f"Player {i+1}" for i in range(nb_players)]
-    scores_df = pd.Series(players_scores, index=players, name="Total Score")
-    return scores_df
+    return leaderboard
 
 
 # Main program execution
 if __name__ == "__main__":
-    wordlist = load_words("words.txt")  # Load the words from file
-    dict_len_word = create_word_length_dict(
-        wordlist
-    )  # Create the dictionary of word lengths
-    save_word_length_dict_to_json(dict_len_word)  # Save the dictionary as a JSON file
+    # Memory-map the compiled word index, rebuilt only when words.txt changes
+    dict_len_word = load_word_index("words.txt")
 
     # Multiplayer game setup
     num_players = int(input("Enter the number of players: "))
     num_words = int(input("Enter the number of rounds per player: "))
+    evil = input("Play the evil mode, where the word dodges your guesses (y/n)? ")
+    difficulty = None
+    if evil.lower() != "y":
+        difficulty = input("Choose a difficulty (easy/medium/hard, empty for any): ")
+        if difficulty.lower() not in ("easy", "medium", "hard"):
+            difficulty = None
+        else:
+            from word_difficulty import sampler_for
+
+            # The scores are computed once for words.txt, before the games rather than during one
+            sampler_for(dict_len_word)
 
     # Get the final scores for all players
-    scores = multiplayer_hangman(num_players, num_words, dict_len_word)
+    scores = multiplayer_hangman(
+        num_players,
+        num_words,
+        dict_len_word,
+        evil=evil.lower() == "y",
+        difficulty=difficulty and difficulty.lower(),
+    )
 
     # Print the final leaderboard
     print("\n--- Final Leaderboard ---")
@@ -0,0 +1,90 @@
+import random
+import numpy as np
+
+from hangman_solver import ALPHABET, BucketTables
+
+"""
+Adversarial host for Hangman ("evil Hangman"): the word is never chosen in advance.
+
+After each guess, the words still possible are split in families by the positions where the
+guessed letter appears, and the host keeps the largest family, a miss being preferred on ties.
+The families are found with np.unique / np.bincount on the per-letter position bitmasks of
+hangman_solver, so a turn stays well under a millisecond even on the largest buckets.
+"""
+
+
+# id of a word list -> (the list, its BucketTables): the tables of a length are built once for all
+# the games, the list is kept so its id can not be reused by another one
+tables_cache = {}
+
+
+def bucket_tables(words):
+    """
+    Returns:
+        BucketTables: The tables of a word list, built on its first game.
+    """
+    cached = tables_cache.get(id(words))
+    if cached is None or cached[0] is not words:
+        cached = tables_cache[id(words)] = (words, BucketTables(words))
+    return cached[1]
+
+
+class EvilHost:
+    """
+    Host of an evil Hangman game, answers the guesses like hangman_game.WordHost.
+    """
+
+    def __init__(self, words):
+        """
+        Args:
+            words: The words of the chosen length, a list or a bucket of a WordIndex.
+
+        Raises:
+            ValueError: If none of the words is made only of the letters a to z.
+        """
+        self.tables = bucket_tables(words)
+        self.length = self.tables.matrix.shape[1]
+        # The words with other characters (e.g. '-') are left out: they are shown from the start
+        # by WordHost, which the families of a word chosen at the end could not match
+        matrix = self.tables.matrix
+        letters = (matrix >= ord("a")) & (matrix <= ord("z"))
+        self.candidates = np.flatnonzero(letters.all(axis=1))
+        if len(self.candidates) == 0:
+            raise ValueError("No word made only of letters to play the evil mode with")
+        self.shown = {}
+
+    def reveal(self, letter):
+        """
+        Keeps the largest family of words for this letter.
+
+        Args:
+            letter (str): The letter guessed.
+
+        Returns:
+            int: Bitmask of the positions of the letter in the family kept, 0 for a miss.
+        """
+        if letter not in ALPHABET or len(letter) != 1:
+            return 0
+        keys = self.tables.letter_masks[ALPHABET.index(letter), self.candidates]
+
+        # Most words do not contain the letter: only the others need to be sorted
+        present = np.flatnonzero(keys)
+        num_missing = len(keys) - len(present)
+        if len(present) == 0:
+            return 0
+        families, family_of = np.unique(keys[present], return_inverse=True)
+        counts = np.bincount(family_of)
+        best = int(np.argmax(counts))
+        if num_missing >= counts[best]:
+            self.candidates = self.candidates[keys == 0]
+            return 0
+
+        self.candidates = self.candidates[present[family_of == best]]
+        return int(families[best])
+
+    def word(self):
+        """
+        Returns:
+            str: A word consistent with every answer, shown at the end of the game.
+        """
+        return self.tables.words[int(random.choice(self.candidates))]
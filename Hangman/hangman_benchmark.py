@@ -0,0 +1,134 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from Hangman import WordHost, play_hangman
+from hangman_solver import FrequencyGuesser
+from word_index import load_word_index
+
+"""
+Batch simulation of a Hangman guesser against the whole dictionary, or a seeded sample of it.
+
+The words are split in batches across a process pool, each worker building the guesser once.
+Every game uses the rules of hangman_game (chances = l // 2 + 1, +2 per letter revealed, -1 per
+miss), and the results are reported per word length.
+
+Usage:
+    python hangman_benchmark.py
+    python hangman_benchmark.py --sample 5000 --seed 1
+"""
+
+GUESSERS = {"frequency": FrequencyGuesser}
+
+# Guesser of the worker process, see init_worker
+worker_guesser = None
+
+
+def init_worker(guesser_name, source_path):
+    """Builds the guesser of a worker process, on the shared memory-mapped word index."""
+    global worker_guesser
+    worker_guesser = GUESSERS[guesser_name](load_word_index(source_path))
+
+
+def play_batch(words):
+    """
+    Plays the worker guesser against a batch of words.
+
+    Args:
+        words (list): The words to guess.
+
+    Returns:
+        np.ndarray: num_words x 4 int32 array of (length, won, misses, score).
+    """
+    results = np.empty((len(words), 4), dtype=np.int32)
+    for i, word in enumerate(words):
+        score, misses, won = play_hangman(WordHost(word), worker_guesser, verbose=False)
+        results[i] = (len(word), won, misses, score)
+    return results
+
+
+def run_simulation(
+    guesser_name="frequency",
+    source_path="words.txt",
+    sample=None,
+    seed=None,
+    workers=None,
+    batch_size=500,
+):
+    """
+    Plays a guesser against every word of the dictionary or a sample of it.
+
+    Args:
+        guesser_name (str): Key of GUESSERS.
+        source_path (str): The word list.
+        sample (int): Number of words drawn at random, None for every word.
+        seed (int): Seed of the sample.
+        workers (int): Number of processes, defaults to the number of CPUs.
+        batch_size (int): Number of words per task sent to the workers.
+
+    Returns:
+        np.ndarray: num_games x 4 array of (length, won, misses, score).
+    """
+    index = load_word_index(source_path)
+    words = [word for length in sorted(index) for word in index[length]]
+    if sample is not None:
+        words = random.Random(seed).sample(words, min(sample, len(words)))
+
+    batches = [words[i : i + batch_size] for i in range(0, len(words), batch_size)]
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        initializer=init_worker,
+        initargs=(guesser_name, source_path),
+    ) as executor:
+        return np.concatenate(list(executor.map(play_batch, batches)))
+
+
+def print_report(results):
+    """
+    Prints the win rate, mean misses and score distribution of each word length.
+
+    Args:
+        results (np.ndarray): See run_simulation.
+    """
+    print(
+        f"{'length':>6} {'games':>6} {'win rate':>9} {'misses':>7} "
+        f"{'score mean':>10} {'min':>5} {'median':>6} {'max':>5}"
+    )
+    rows = [
+        (length, results[results[:, 0] == length])
+        for length in np.unique(results[:, 0])
+    ]
+    rows.append(("all", results))
+    for length, games in rows:
+        scores = games[:, 3]
+        print(
+            f"{length:>6} {len(games):>6} {games[:, 1].mean():>9.2%} "
+            f"{games[:, 2].mean():>7.2f} {scores.mean():>10.2f} {scores.min():>5} "
+            f"{np.median(scores):>6.1f} {scores.max():>5}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Plays a Hangman guesser against the whole dictionary."
+    )
+    parser.add_argument("--guesser", choices=GUESSERS, default="frequency")
+    parser.add_argument("--words", default="words.txt", help="Word list.")
+    parser.add_argument("--sample", type=int, help="Number of words drawn at random.")
+    parser.add_argument("--seed", type=int, help="Seed of the sample.")
+    parser.add_argument("--workers", type=int, help="Number of processes.")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    results = run_simulation(
+        args.guesser, args.words, args.sample, args.seed, args.workers
+    )
+    elapsed = time.time() - start_time
+    print_report(results)
+    print(
+        f"\n{len(results)} games played in {elapsed:.2f} seconds "
+        f"({len(results) / elapsed:.0f} games per second)."
+    )
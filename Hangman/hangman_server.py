@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import itertools
+import random
+
+from Hangman import GameState, Leaderboard, WordHost
+from word_index import load_word_index
+
+"""
+Multiplayer Hangman server: many independent games at once over local sockets.
+
+Each connection is one player. The word index is memory-mapped once and shared by every game,
+and a game is a GameState of Hangman.py, the same rules as the local game: its word host, a
+26-bit mask of the letters guessed and a mask of the positions revealed. The total scores go to
+a shared Leaderboard.
+
+Line protocol, one request per line:
+    name <player>      -> 'ok', the player name in the leaderboard
+    new <length>       -> '<word state> <chances left>', e.g. '_ _ _ _ _ 3'
+    guess <letter>     -> 'hit|miss|repeat <word state> <chances left>',
+                          then 'won|lost <word> <score>' at the end of the game
+    leaderboard [n]    -> the n best players, 'player: score points' separated by ' | '
+    quit               -> closes the connection
+Errors are answered with 'error <message>'. The rules are the ones of hangman_game.
+
+Usage:
+    python hangman_server.py --port 8766
+"""
+
+
+class HangmanServer:
+    """
+    Games of all the connected players, on a shared word index.
+    """
+
+    def __init__(self, dict_len_word):
+        self.dict_len_word = dict_len_word
+        self.leaderboard = Leaderboard()
+        self.player_ids = itertools.count(1)
+
+    def handle(self, player: dict, line: str):
+        """
+        Answers one request of a player.
+
+        Args:
+            player (dict): The connection state: 'name' and the current 'session' (or None).
+            line (str): The request.
+
+        Returns:
+            str: The response line, None to close the connection.
+        """
+        command, *args = line.split()
+        session = player["session"]
+
+        if command == "name" and args:
+            player["name"] = " ".join(args)
+            return "ok"
+
+        if command == "new" and args and args[0].isdigit():
+            length = int(args[0])
+            if length not in self.dict_len_word:
+                return f"error no words of length {length}"
+            session = GameState(WordHost(random.choice(self.dict_len_word[length])))
+            player["session"] = session
+            return f"{session.state()} {session.chances_left()}"
+
+        if command == "guess" and args:
+            letter = args[0].lower()
+            if session is None:
+                return "error no game in progress"
+            result = session.guess(letter)
+            if result == "invalid":
+                return f"error invalid letter: {letter}"
+            if session.over():
+                player["session"] = None
+                self.leaderboard.add(player["name"], session.score)
+                outcome = "won" if session.won() else "lost"
+                return f"{outcome} {session.host.word()} {session.score}"
+            return f"{result} {session.state()} {session.chances_left()}"
+
+        if command == "leaderboard":
+            n = int(args[0]) if args and args[0].isdigit() else 10
+            return " | ".join(
+                f"{name}: {score} points" for name, score in self.leaderboard.top(n)
+            )
+
+        if command == "quit":
+            return None
+
+        return f"error invalid request: {line}"
+
+    async def handle_connection(self, reader, writer):
+        player = {"name": f"Player {next(self.player_ids)}", "session": None}
+        try:
+            while line := await reader.readline():
+                line = line.decode().strip()
+                if not line:
+                    continue
+                response = self.handle(player, line)
+                if response is None:
+                    break
+                writer.write(response.encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(
+            self.handle_connection, host, port, backlog=1024
+        )
+        print(f"🤖 : Hangman server listening on {host}:{port}.", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serves Hangman games to many players."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host.")
+    parser.add_argument("--port", type=int, default=8766, help="TCP port.")
+    parser.add_argument("--words", default="words.txt", help="Word list.")
+    args = parser.parse_args()
+
+    server = HangmanServer(load_word_index(args.words))
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
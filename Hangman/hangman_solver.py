@@ -0,0 +1,157 @@
+import numpy as np
+
+"""
+Automatic Hangman guesser: keeps the words still possible and plays the most common letter.
+
+For each word length, the words are held as a NumPy char matrix and every word gets one bitmask
+per letter, bit i being set when the letter is at position i. A reveal (or a miss, an empty
+bitmask) is then checked against all the candidates with a single comparison.
+"""
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+# Used once no candidate is left, e.g. for a word missing from the dictionary
+FALLBACK_ORDER = "etaoinshrdlcumwfgypbvkjxqz"
+OPENING_DEPTH = 3  # Number of first guesses memoized per word length
+
+
+def word_matrix(words):
+    """
+    Args:
+        words: The words of one length, a list or a bucket of a WordIndex.
+
+    Returns:
+        np.ndarray: count x length uint8 array of the ASCII codes.
+    """
+    if hasattr(words, "matrix"):  # WordBucket: view on the memory-mapped index
+        return words.matrix()
+    length = len(words[0]) if len(words) else 0
+    data = "".join(words).encode("ascii")
+    return np.frombuffer(data, np.uint8).reshape(len(words), length)
+
+
+def position_masks(matrix: np.ndarray):
+    """
+    Computes, for each word and each letter, the bitmask of the positions of the letter.
+
+    Args:
+        matrix (np.ndarray): count x length uint8 array of the words.
+
+    Returns:
+        np.ndarray: count x 26 uint32 array, 0 when the word does not contain the letter.
+
+    Raises:
+        ValueError: If the words are longer than the 32 bits of a mask.
+    """
+    count, length = matrix.shape
+    if length > 32:
+        raise ValueError("Words longer than 32 letters are not supported")
+    masks = np.zeros((count, len(ALPHABET)), dtype=np.uint32)
+    codes = matrix.astype(np.int64) - ord("a")
+    words = np.arange(count)
+    for position in range(length):
+        # Other characters (e.g. '-') can not be guessed, they are left out
+        letters = (codes[:, position] >= 0) & (codes[:, position] < len(ALPHABET))
+        masks[words[letters], codes[letters, position]] |= np.uint32(1 << position)
+    return masks
+
+
+class BucketTables:
+    """
+    Precomputed arrays of the words of one length.
+    """
+
+    def __init__(self, words):
+        self.words = words
+        self.matrix = word_matrix(words)
+        # 26 x count: the masks of one letter are contiguous, for the filtering
+        self.letter_masks = np.ascontiguousarray(position_masks(self.matrix).T)
+        # The first guesses of a game only depend on the previous answers and are the slowest,
+        # with the most candidates: they are computed once, (letter, positions) history -> letter
+        self.openings = {}
+
+
+class FrequencyGuesser:
+    """
+    Candidate-filtering guesser: keeps the words consistent with every reveal and miss, and
+    guesses the letter contained by the most candidates.
+    """
+
+    def __init__(self, dict_len_word):
+        """
+        Args:
+            dict_len_word (dict): Word lengths mapped to their words, see create_word_length_dict
+                and word_index.load_word_index.
+        """
+        self.dict_len_word = dict_len_word
+        self.tables = {}  # Word length -> BucketTables, built on first use
+        self.bucket = None
+        self.candidates = None
+        self.history = []  # (letter, positions) of the guesses of the game
+
+    def get_tables(self, length: int):
+        if length not in self.tables:
+            self.tables[length] = BucketTables(self.dict_len_word[length])
+        return self.tables[length]
+
+    def start(self, length: int):
+        """
+        Starts a new game, every word of the length is a candidate.
+
+        Args:
+            length (int): The length of the word to guess.
+        """
+        self.bucket = self.get_tables(length) if length in self.dict_len_word else None
+        num_words = len(self.bucket.words) if self.bucket is not None else 0
+        self.candidates = np.arange(num_words)
+        self.history = []
+
+    def next_letter(self):
+        """
+        Returns:
+            str: The letter to guess.
+        """
+        if self.bucket is not None and len(self.history) < OPENING_DEPTH:
+            key = tuple(self.history)
+            if key not in self.bucket.openings:
+                self.bucket.openings[key] = self.best_letter()
+            return self.bucket.openings[key]
+        return self.best_letter()
+
+    def best_letter(self):
+        """
+        Returns:
+            str: The letter not guessed yet contained by the most candidates.
+        """
+        counts = np.zeros(len(ALPHABET), dtype=np.int64)
+        if len(self.candidates):
+            counts = np.count_nonzero(
+                self.bucket.letter_masks[:, self.candidates], axis=1
+            )
+        for letter, _ in self.history:
+            if letter in ALPHABET:
+                counts[ALPHABET.index(letter)] = -1
+
+        if counts.max() > 0:
+            return ALPHABET[int(np.argmax(counts))]
+        guessed = [letter for letter, _ in self.history]
+        return next(letter for letter in FALLBACK_ORDER if letter not in guessed)
+
+    def update(self, letter: str, positions: int):
+        """
+        Keeps the candidates having the letter exactly at the revealed positions.
+
+        Args:
+            letter (str): The letter guessed.
+            positions (int): Bitmask of the positions revealed, 0 for a miss.
+        """
+        self.history.append((letter, positions))
+        if letter in ALPHABET and len(self.candidates):
+            column = self.bucket.letter_masks[ALPHABET.index(letter), self.candidates]
+            self.candidates = self.candidates[column == positions]
+
+    def remaining_words(self):
+        """
+        Returns:
+            list: The words still possible.
+        """
+        return [self.bucket.words[int(i)] for i in self.candidates]
@@ -0,0 +1,305 @@
+import argparse
+import hashlib
+import os
+import numpy as np
+
+from hangman_solver import ALPHABET, word_matrix
+from word_index import AtomicWrite, load_word_index
+
+"""
+Cache of the letter frequency tables of the Hangman dictionary, for the strategies and hints.
+
+For each word length, the cache holds:
+    - the number of words,
+    - letters: 26 int32, the number of words containing each letter,
+    - positions: length x 26 int32, the number of words having each letter at each position,
+    - digest: 16 bytes, the BLAKE2b digest of the words counted, as stored in the word index.
+
+The tables are computed once per version of the word list, keyed by its SHA-256 (the hash of the
+word index), and stored as one uncompressed .npz archive. Opening the cache only reads the word
+counts: the tables of a length are read from the archive on first use. When the word list
+changes, the digest of the words of each length in the new index is compared with the stored
+one, and only the lengths whose words changed are counted again: an edit of the word list usually
+touches few lengths, and the others are not read again.
+"""
+
+
+def count_letters(matrix: np.ndarray):
+    """
+    Counts the letters of words of one length.
+
+    Args:
+        matrix (np.ndarray): count x length uint8 array of the words, see word_matrix.
+
+    Returns:
+        tuple: The letters (26,) and positions (length x 26) int32 counts.
+    """
+    count, length = matrix.shape
+    codes = matrix.astype(np.int64) - ord("a")
+    # Other characters (e.g. '-') are not letters of the game, they are left out
+    valid = (codes >= 0) & (codes < len(ALPHABET))
+
+    positions = np.zeros((length, len(ALPHABET)), dtype=np.int32)
+    for position in range(length):
+        positions[position] = np.bincount(
+            codes[valid[:, position], position], minlength=len(ALPHABET)
+        )
+
+    present = np.zeros((count, len(ALPHABET)), dtype=bool)
+    rows = np.broadcast_to(np.arange(count)[:, None], codes.shape)
+    present[rows[valid], codes[valid]] = True
+    letters = np.count_nonzero(present, axis=0).astype(np.int32)
+    return letters, positions
+
+
+def words_digest(matrix: np.ndarray):
+    """
+    Returns:
+        bytes: The BLAKE2b digest of the words of one length, see word_matrix.
+    """
+    return hashlib.blake2b(
+        np.ascontiguousarray(matrix).tobytes(), digest_size=16
+    ).digest()
+
+
+def group_by_length(words):
+    """
+    Returns:
+        dict: Word length -> list of the words of this length.
+    """
+    groups = {}
+    for word in words:
+        groups.setdefault(len(word), []).append(word)
+    return groups
+
+
+class LetterStats:
+    """
+    Letter frequency tables of each word length, loaded lazily from a cache archive.
+    """
+
+    def __init__(self, source_hash: bytes, word_counts: dict, archive=None):
+        """
+        Args:
+            source_hash (bytes): The SHA-256 of the word list the tables were counted on.
+            word_counts (dict): Word length -> number of words.
+            archive: The opened .npz archive holding the tables, None if they are all in memory.
+        """
+        self.source_hash = source_hash
+        self.word_counts = word_counts
+        self.archive = archive
+        self.tables = {}  # Word length -> (letters, positions), read on first use
+        # Word length -> digest of the words counted, None once changed by add_words or
+        # remove_words
+        self.digests = {}
+
+    def get_tables(self, length: int):
+        if length not in self.tables:
+            if self.archive is not None and f"letters_{length}" in self.archive:
+                self.tables[length] = (
+                    self.archive[f"letters_{length}"],
+                    self.archive[f"positions_{length}"],
+                )
+            else:
+                self.tables[length] = (
+                    np.zeros(len(ALPHABET), dtype=np.int32),
+                    np.zeros((length, len(ALPHABET)), dtype=np.int32),
+                )
+        return self.tables[length]
+
+    def get_digest(self, length: int):
+        """
+        Returns:
+            bytes: The digest of the words of the length counted, None if unknown.
+        """
+        if length not in self.digests:
+            if self.archive is not None and f"digest_{length}" in self.archive:
+                self.digests[length] = self.archive[f"digest_{length}"].tobytes()
+            else:
+                self.digests[length] = None
+        return self.digests[length]
+
+    def letter_counts(self, length: int):
+        """
+        Returns:
+            np.ndarray: The number of words of the length containing each letter.
+        """
+        return self.get_tables(length)[0]
+
+    def position_counts(self, length: int):
+        """
+        Returns:
+            np.ndarray: length x 26, the number of words having each letter at each position.
+        """
+        return self.get_tables(length)[1]
+
+    def letter_frequencies(self, length: int):
+        """
+        Returns:
+            np.ndarray: The fraction of the words of the length containing each letter.
+        """
+        return self.letter_counts(length) / max(self.word_counts.get(length, 0), 1)
+
+    def count_words(self, length: int, words, sign: int):
+        """
+        Adds (sign 1) or subtracts (sign -1) the counts of words of one length to the tables.
+        """
+        if not words:
+            return
+        letters, positions = count_letters(word_matrix(words))
+        old_letters, old_positions = self.get_tables(length)
+        # New arrays: the previous ones may still be held by callers
+        self.tables[length] = (
+            old_letters + sign * letters,
+            old_positions + sign * positions,
+        )
+        self.word_counts[length] = self.word_counts.get(length, 0) + sign * len(words)
+
+    def add_words(self, words):
+        """
+        Updates the tables with new words, without counting the others again.
+        """
+        for length, group in group_by_length(words).items():
+            self.count_words(length, group, 1)
+            # The order of the words in the index is unknown: the next sync counts them again
+            self.digests[length] = None
+
+    def remove_words(self, words):
+        """
+        Updates the tables with removed words, which must have been counted.
+        """
+        for length, group in group_by_length(words).items():
+            self.count_words(length, group, -1)
+            self.digests[length] = None
+
+    def sync(self, dict_len_word, source_hash: bytes):
+        """
+        Updates the tables to a new version of the word list, counting again only the lengths
+        whose words changed since the tables were counted.
+
+        Args:
+            dict_len_word: The new word index.
+            source_hash (bytes): Its SHA-256.
+        """
+        for length in sorted(set(self.word_counts) | set(dict_len_word)):
+            if length not in dict_len_word:
+                self.word_counts.pop(length, None)
+                self.tables.pop(length, None)
+                self.digests.pop(length, None)
+                continue
+            matrix = word_matrix(dict_len_word[length])
+            digest = words_digest(matrix)
+            if digest == self.get_digest(length):
+                continue  # Most lengths are left unchanged by an edit of the word list
+            self.word_counts[length] = len(matrix)
+            self.tables[length] = count_letters(matrix)
+            self.digests[length] = digest
+        self.source_hash = source_hash
+
+    def save(self, path: str, source_hash: bytes = None):
+        """
+        Writes the tables, see AtomicWrite.
+
+        Args:
+            path (str): The .npz archive.
+            source_hash (bytes): The hash of the new word list after add_words / remove_words,
+                None to keep the current one.
+        """
+        if source_hash is not None:
+            self.source_hash = source_hash
+        lengths = sorted(length for length, count in self.word_counts.items() if count)
+        arrays = {
+            "source_hash": np.frombuffer(self.source_hash, np.uint8),
+            "lengths": np.array(lengths, dtype=np.int32),
+            "word_counts": np.array(
+                [self.word_counts[length] for length in lengths], dtype=np.int32
+            ),
+        }
+        for length in lengths:
+            letters, positions = self.get_tables(length)
+            arrays[f"letters_{length}"] = letters
+            arrays[f"positions_{length}"] = positions
+            digest = self.get_digest(length)
+            if digest is not None:
+                arrays[f"digest_{length}"] = np.frombuffer(digest, np.uint8)
+
+        with AtomicWrite(path) as f:
+            np.savez(f, **arrays)
+
+
+def compute_letter_stats(dict_len_word, source_hash: bytes):
+    """
+    Counts the tables of every word length.
+
+    Args:
+        dict_len_word: Word lengths mapped to their words, e.g. a WordIndex.
+        source_hash (bytes): The SHA-256 of the word list.
+
+    Returns:
+        LetterStats: The tables, all in memory.
+    """
+    stats = LetterStats(source_hash, {})
+    for length in sorted(dict_len_word):
+        matrix = word_matrix(dict_len_word[length])
+        stats.word_counts[length] = len(matrix)
+        stats.tables[length] = count_letters(matrix)
+        stats.digests[length] = words_digest(matrix)
+    return stats
+
+
+def open_letter_stats(path: str):
+    """
+    Returns:
+        LetterStats: The cache of an archive, None if it is missing or invalid.
+    """
+    try:
+        archive = np.load(path)
+        lengths = archive["lengths"]
+        word_counts = dict(zip(lengths.tolist(), archive["word_counts"].tolist()))
+        return LetterStats(archive["source_hash"].tobytes(), word_counts, archive)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_letter_stats(source_path: str = "words.txt", path: str = None):
+    """
+    Opens the letter frequency tables of a word list, counting them first if they are missing,
+    or counting again the lengths whose words changed if the word list changed.
+
+    Args:
+        source_path (str): The word list, one word per line.
+        path (str): The cache archive, defaults to the word list path with a '_letters.npz'
+            suffix.
+
+    Returns:
+        LetterStats: The tables of each word length.
+    """
+    if path is None:
+        path = os.path.splitext(source_path)[0] + "_letters.npz"
+    index = load_word_index(source_path)
+    stats = open_letter_stats(path)
+    if stats is None:
+        compute_letter_stats(index, index.source_hash).save(path)
+        stats = open_letter_stats(path)
+    elif stats.source_hash != index.source_hash:
+        stats.sync(index, index.source_hash)
+        stats.save(path)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Prints the most frequent letters of each word length."
+    )
+    parser.add_argument("--words", default="words.txt", help="Word list.")
+    parser.add_argument("--top", type=int, default=8, help="Number of letters.")
+    args = parser.parse_args()
+
+    stats = load_letter_stats(args.words)
+    for length in sorted(stats.word_counts):
+        frequencies = stats.letter_frequencies(length)
+        best = np.argsort(-frequencies, kind="stable")[: args.top]
+        letters = " ".join(
+            f"{ALPHABET[i]} {frequencies[i]:.0%}" for i in best if frequencies[i]
+        )
+        print(f"{length:>2} letters, {stats.word_counts[length]:>5} words: {letters}")
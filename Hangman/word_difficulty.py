@@ -0,0 +1,212 @@
+import argparse
+import functools
+import os
+import random
+import struct
+import time
+import numpy as np
+
+from hangman_benchmark import run_simulation
+from word_index import AtomicWrite, load_word_index
+
+"""
+Difficulty scores of the Hangman words, to pick the word of a game within a difficulty band.
+
+The score of a word is the number of misses of the candidate-filtering FrequencyGuesser of
+hangman_solver against it, computed offline for the whole dictionary by the parallel simulation
+of hangman_benchmark. A game is lost after l // 2 + 1 misses, so the score also tells the words
+the guesser could not find. The bands of a word length are:
+    - easy: found without any miss.
+    - medium: found with at least one miss.
+    - hard: not found.
+
+Scores file format (little-endian), stored next to the word index:
+    - magic: b"HMWDIF01"
+    - source_hash: 32 bytes, SHA-256 of the word list, as in the word index.
+    - count: uint32, then 4 padding bytes.
+    - scores: count x uint8, the misses of each word, in the order of the word index.
+
+At runtime, the word ids of each length are sorted by score once, so each band is a contiguous
+slice of them and a word of a band is drawn in O(1).
+"""
+
+MAGIC = b"HMWDIF01"
+HEADER = struct.Struct("<8s32sI4x")
+DIFFICULTY_BANDS = ("easy", "medium", "hard")
+
+
+def score_words(source_path: str = "words.txt", workers: int = None):
+    """
+    Plays the FrequencyGuesser against every word of a word list, across a process pool.
+
+    Returns:
+        np.ndarray: The misses of each word, uint8, in the order of the word index.
+    """
+    results = run_simulation("frequency", source_path, workers=workers)
+    return results[:, 2].astype(np.uint8)
+
+
+def save_scores(path: str, source_hash: bytes, scores: np.ndarray):
+    """Writes a scores file, see AtomicWrite."""
+    with AtomicWrite(path) as f:
+        f.write(HEADER.pack(MAGIC, source_hash, len(scores)))
+        f.write(scores.astype(np.uint8).tobytes())
+
+
+def load_scores(path: str):
+    """
+    Returns:
+        tuple: The source hash and the scores of a scores file, None if it is missing or invalid.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, source_hash, count = HEADER.unpack_from(data)
+    if magic != MAGIC or len(data) != HEADER.size + count:
+        return None
+    return source_hash, np.frombuffer(data, np.uint8, offset=HEADER.size)
+
+
+class DifficultySampler:
+    """
+    Draws the words of a length within a difficulty band.
+    """
+
+    def __init__(self, dict_len_word, scores: np.ndarray):
+        """
+        Args:
+            dict_len_word: The word index the scores were computed on.
+            scores (np.ndarray): The misses of each word, in the order of the word index.
+        """
+        self.dict_len_word = dict_len_word
+        self.scores = {}  # Word length -> scores of its words
+        start = 0
+        for length in sorted(dict_len_word):
+            count = len(dict_len_word[length])
+            self.scores[length] = scores[start : start + count]
+            start += count
+        if start != len(scores):
+            raise ValueError("The scores do not match the word index")
+        # Word length -> (word ids sorted by score, band -> (start, end))
+        self.bands = {}
+
+    def get_bands(self, length: int):
+        if length not in self.bands:
+            scores = self.scores[length]
+            order = np.argsort(scores, kind="stable")
+            sorted_scores = scores[order]
+            chances = length // 2 + 1
+            bounds = np.searchsorted(sorted_scores, [0, 1, chances, chances + 1])
+            self.bands[length] = (
+                order,
+                {
+                    "easy": (int(bounds[0]), int(bounds[1])),
+                    "medium": (int(bounds[1]), int(bounds[2])),
+                    "hard": (int(bounds[2]), int(bounds[3])),
+                },
+            )
+        return self.bands[length]
+
+    def band_size(self, length: int, band: str):
+        """
+        Returns:
+            int: The number of words of the length in the band.
+        """
+        start, end = self.get_bands(length)[1][band]
+        return end - start
+
+    def sample(self, length: int, band: str, rng=random):
+        """
+        Draws a word of a length within a band, or of any difficulty if the band is empty for
+        this length.
+
+        Args:
+            length (int): The word length.
+            band (str): One of DIFFICULTY_BANDS.
+            rng: The random generator.
+
+        Returns:
+            str: The word.
+        """
+        order, bands = self.get_bands(length)
+        start, end = bands[band]
+        if start == end:
+            start, end = 0, len(order)
+        return self.dict_len_word[length][
+            int(order[start + rng.randrange(end - start)])
+        ]
+
+
+def load_word_difficulty(
+    source_path: str = "words.txt", path: str = None, workers: int = None
+):
+    """
+    Opens the difficulty scores of a word list, computing them first if they are missing or
+    out of date.
+
+    Args:
+        source_path (str): The word list, one word per line.
+        path (str): The scores file, defaults to the word list path with a '.difficulty'
+            extension.
+        workers (int): Number of processes of the computation, defaults to the number of CPUs.
+
+    Returns:
+        DifficultySampler: The sampler of the word index.
+    """
+    if path is None:
+        path = os.path.splitext(source_path)[0] + ".difficulty"
+    index = load_word_index(source_path)
+    stored = load_scores(path)
+    if stored is None or stored[0] != index.source_hash:
+        print("🤖 : Computing the difficulty of the words, this is done only once...")
+        save_scores(path, index.source_hash, score_words(source_path, workers))
+        stored = load_scores(path)
+    return DifficultySampler(index, stored[1])
+
+
+@functools.lru_cache(maxsize=None)
+def default_sampler():
+    """
+    Returns:
+        DifficultySampler: The sampler of words.txt, loaded once.
+    """
+    return load_word_difficulty()
+
+
+def sampler_for(dict_len_word):
+    """
+    Returns:
+        DifficultySampler: The sampler of words.txt, when dict_len_word is its word index.
+
+    Raises:
+        ValueError: If dict_len_word is not the word index of words.txt, e.g. a plain dictionary
+            of create_word_length_dict, which has no difficulty scores.
+    """
+    source_hash = getattr(dict_len_word, "source_hash", None)
+    if source_hash is None or source_hash != load_word_index().source_hash:
+        raise ValueError(
+            "A difficulty requires the word index of words.txt, "
+            "open it with word_index.load_word_index('words.txt')"
+        )
+    return default_sampler()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Computes the difficulty scores of the Hangman words."
+    )
+    parser.add_argument("--words", default="words.txt", help="Word list.")
+    parser.add_argument("--workers", type=int, help="Number of processes.")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    sampler = load_word_difficulty(args.words, workers=args.workers)
+    print(f"Scores ready in {time.time() - start_time:.2f} seconds.\n")
+    print(f"{'length':>6} " + " ".join(f"{band:>6}" for band in DIFFICULTY_BANDS))
+    for length in sorted(sampler.scores):
+        sizes = (sampler.band_size(length, band) for band in DIFFICULTY_BANDS)
+        print(f"{length:>6} " + " ".join(f"{size:>6}" for size in sizes))
@@ -0,0 +1,231 @@
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+
+"""
+Compiled, memory-mapped index of the Hangman word list.
+
+The words are grouped by length and stored in one contiguous blob: the words of a length all have
+the same width, so a group is found from its offset and count only, without any separator.
+
+Index file format (little-endian):
+    - magic: b"HMWIDX01"
+    - source_size, source_mtime_ns: 2 x uint64, stat of the word list when the index was built.
+    - source_hash: 32 bytes, SHA-256 of the word list.
+    - num_lengths: uint32, then 4 padding bytes.
+    - table: num_lengths x (length: uint32, count: uint32, offset: uint64), sorted by length.
+    - blob: the words of each length, in the order of the word list.
+
+The index is rebuilt only when the word list changes: when its size or modification time differ
+from the ones stored, its hash is compared before rebuilding.
+"""
+
+MAGIC = b"HMWIDX01"
+HEADER = struct.Struct("<8sQQ32sI4x")
+ENTRY = struct.Struct("<IIQ")
+
+
+class AtomicWrite:
+    """
+    Opens a temporary file next to path for binary writing, and moves it to path once written:
+    an interrupted write leaves the previous file, or none, but never a partial one.
+
+    A class rather than contextlib.contextmanager, which would add contextlib to the start-up.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.temporary_path = path + ".tmp"
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.temporary_path, "wb")
+        return self.file
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.temporary_path, self.path)
+        else:
+            try:
+                os.remove(self.temporary_path)
+            except OSError:
+                pass
+
+
+def file_hash(path: str):
+    """
+    Returns:
+        bytes: The SHA-256 digest of a file.
+    """
+    import hashlib  # Only needed when the word list changed, kept out of the start-up
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def build_word_index(source_path: str, index_path: str):
+    """
+    Compiles a word list, one word per line, into an index file.
+
+    Raises:
+        ValueError: If a word is not ASCII, the fixed widths need one byte per letter.
+    """
+    stat = os.stat(source_path)
+    groups = {}
+    with open(source_path, "rb") as f:
+        for line in f:
+            word = line.rstrip()
+            if not word.isascii():
+                raise ValueError(f"The word index only supports ASCII words: {word!r}")
+            groups.setdefault(len(word), []).append(word)
+
+    lengths = sorted(groups)
+    offset = HEADER.size + ENTRY.size * len(lengths)
+    table = []
+    for length in lengths:
+        table.append(ENTRY.pack(length, len(groups[length]), offset))
+        offset += length * len(groups[length])
+
+    with AtomicWrite(index_path) as f:
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                stat.st_size,
+                stat.st_mtime_ns,
+                file_hash(source_path),
+                len(lengths),
+            )
+        )
+        f.write(b"".join(table))
+        for length in lengths:
+            f.write(b"".join(groups[length]))
+
+
+def index_is_fresh(source_path: str, index_path: str):
+    """
+    Checks that an index file was built from the current word list.
+    When only the stat changed (e.g. the file was touched), the stat stored is refreshed.
+
+    Returns:
+        bool: True if the index can be used.
+    """
+    if not os.path.exists(index_path):
+        return False
+    with open(index_path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return False
+    magic, size, mtime_ns, source_hash, num_lengths = HEADER.unpack(header)
+    if magic != MAGIC:
+        return False
+
+    stat = os.stat(source_path)
+    if (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+        return True
+    if size != stat.st_size or file_hash(source_path) != source_hash:
+        return False
+
+    with open(index_path, "r+b") as f:
+        f.write(HEADER.pack(MAGIC, size, stat.st_mtime_ns, source_hash, num_lengths))
+    return True
+
+
+class WordBucket(Sequence):
+    """
+    The words of one length, read from the memory-mapped blob on access.
+    """
+
+    def __init__(self, buffer: mmap.mmap, length: int, count: int, offset: int):
+        self.buffer = buffer
+        self.length = length
+        self.count = count
+        self.offset = offset
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.count))]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("word index out of range")
+        start = self.offset + i * self.length
+        return self.buffer[start : start + self.length].decode("ascii")
+
+    def matrix(self):
+        """
+        Zero-copy view of the words.
+
+        Returns:
+            np.ndarray: Read-only count x length uint8 array of the ASCII codes.
+        """
+        import numpy as np
+
+        return np.frombuffer(
+            self.buffer, np.uint8, self.count * self.length, self.offset
+        ).reshape(self.count, self.length)
+
+
+class WordIndex(Mapping):
+    """
+    Read-only mapping word length -> words of this length, as the dictionary of
+    create_word_length_dict, backed by a memory-mapped index file.
+    """
+
+    def __init__(self, index_path: str):
+        """
+        Raises:
+            ValueError: If the file is not a word index.
+        """
+        with open(index_path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, _, self.source_hash, num_lengths = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{index_path} is not a word index")
+
+        self.buckets = {}
+        for i in range(num_lengths):
+            length, count, offset = ENTRY.unpack_from(
+                self.buffer, HEADER.size + i * ENTRY.size
+            )
+            self.buckets[length] = WordBucket(self.buffer, length, count, offset)
+
+    def __getitem__(self, length):
+        return self.buckets[length]
+
+    def __iter__(self):
+        return iter(self.buckets)
+
+    def __len__(self):
+        return len(self.buckets)
+
+    def matrix(self, length: int):
+        """
+        Zero-copy view of the words of one length, see WordBucket.matrix.
+        """
+        return self.buckets[length].matrix()
+
+
+def load_word_index(source_path: str = "words.txt", index_path: str = None):
+    """
+    Opens the index of a word list, compiling it first if it is missing or out of date.
+
+    Args:
+        source_path (str): The word list, one word per line.
+        index_path (str): The index file, defaults to the word list path with a '.idx' extension.
+
+    Returns:
+        WordIndex: The word lengths mapped to their words.
+    """
+    if index_path is None:
+        index_path = os.path.splitext(source_path)[0] + ".idx"
+    if not index_is_fresh(source_path, index_path):
+        build_word_index(source_path, index_path)
+    return WordIndex(index_path)
@@ -0,0 +1,159 @@
+import argparse
+import time
+import numpy as np
+
+from hangman_solver import word_matrix
+from word_index import load_word_index
+
+"""
+Pattern queries over the Hangman dictionary, e.g. all the words matching 'a_e__' without 'r' or 's'.
+
+For each word length and each position, the word ids (their index in dict_len_word[length]) are
+sorted by the letter at this position: the ids of the words having a letter at a position are
+then one contiguous, sorted slice, the inverted index (length, position, letter) -> word ids.
+A query intersects the slices of the known letters with NumPy, then checks the blanks of the few
+words left. A pattern without any known letter only has excluded letters: it is answered from a
+precomputed bitmask of the letters of each word, without any intersection.
+
+The blanks follow the Hangman rules: a blank can not be one of the known letters, which would have
+been revealed, nor an excluded letter.
+"""
+
+BLANK = "_"
+
+
+class LengthIndex:
+    """
+    Inverted index of the words of one length.
+    """
+
+    def __init__(self, words):
+        self.matrix = word_matrix(words)
+        # Column p: the word ids sorted by their letter at position p, and these letters
+        self.order = np.argsort(self.matrix, axis=0, kind="stable").T.copy()
+        self.sorted_letters = np.take_along_axis(self.matrix.T, self.order, axis=1)
+        # Bit i of a word set when it contains the i-th letter of the alphabet, for the patterns
+        # without any known letter
+        self.letter_sets = np.zeros(len(self.matrix), dtype=np.uint32)
+        for column in self.matrix.T:
+            codes = column.astype(np.int64) - ord("a")
+            letters = (codes >= 0) & (codes < 26)
+            self.letter_sets[letters] |= (1 << codes[letters]).astype(np.uint32)
+
+    def words_without(self, letters: str):
+        """
+        Returns:
+            np.ndarray: The sorted ids of the words containing none of the letters.
+        """
+        mask = 0
+        for letter in set(letters):
+            if "a" <= letter <= "z":
+                mask |= 1 << ord(letter) - ord("a")
+        return np.flatnonzero((self.letter_sets & np.uint32(mask)) == 0)
+
+    def word_ids(self, position: int, letter: str):
+        """
+        Returns:
+            np.ndarray: The sorted ids of the words having the letter at the position.
+        """
+        code = ord(letter)
+        letters = self.sorted_letters[position]
+        start = np.searchsorted(letters, code, side="left")
+        end = np.searchsorted(letters, code, side="right")
+        return self.order[position, start:end]
+
+
+class PatternIndex:
+    """
+    Pattern queries over a dictionary of word lengths, see create_word_length_dict.
+    """
+
+    def __init__(self, dict_len_word):
+        """
+        Args:
+            dict_len_word (dict): Word lengths mapped to their words, the indexes of each length
+                are built on first query.
+        """
+        self.dict_len_word = dict_len_word
+        self.lengths = {}
+
+    def get_length_index(self, length: int):
+        if length not in self.lengths:
+            self.lengths[length] = LengthIndex(self.dict_len_word[length])
+        return self.lengths[length]
+
+    def query_ids(self, pattern: str, excluded: str = ""):
+        """
+        Args:
+            pattern (str): The known letters and '_' for the blanks, e.g. 'a_e__'.
+            excluded (str): Letters that are not in the word.
+
+        Returns:
+            np.ndarray: The sorted ids of the matching words in dict_len_word[len(pattern)].
+        """
+        length = len(pattern)
+        if length not in self.dict_len_word:
+            return np.empty(0, dtype=np.int64)
+        index = self.get_length_index(length)
+
+        known = [(i, letter) for i, letter in enumerate(pattern) if letter != BLANK]
+        if not known:
+            # Nothing to intersect: one pass on the precomputed letter sets
+            return index.words_without(excluded)
+
+        # Intersect from the smallest slice, so each step works on few ids
+        slices = sorted((index.word_ids(i, letter) for i, letter in known), key=len)
+        ids = slices[0]
+        for other in slices[1:]:
+            if len(ids) == 0:
+                break
+            ids = np.intersect1d(ids, other, assume_unique=True)
+
+        blanks = [i for i, letter in enumerate(pattern) if letter == BLANK]
+        # The words are stored as bytes: other characters can not be in them, nor be forbidden
+        forbidden = {
+            ord(letter)
+            for letter in {letter for _, letter in known} | set(excluded)
+            if ord(letter) < 256
+        }
+        if len(ids) and blanks:
+            # Lookup table of the byte values, faster than np.isin on large buckets
+            is_forbidden = np.zeros(256, dtype=bool)
+            is_forbidden[list(forbidden)] = True
+            blank_letters = index.matrix[np.ix_(ids, blanks)]
+            ids = ids[~is_forbidden[blank_letters].any(axis=1)]
+        return ids
+
+    def query(self, pattern: str, excluded: str = ""):
+        """
+        Returns:
+            list: The matching words, see query_ids.
+
+        Example:
+            >>> patterns = PatternIndex({3: ["cat", "cot", "dog"]})
+            >>> patterns.query("c__", excluded="oé")
+            ['cat']
+        """
+        length = len(pattern)
+        ids = self.query_ids(pattern, excluded)
+        if len(ids) == 0:
+            return []
+        # The rows of the matrix are the ASCII words: one decode instead of one per word
+        text = self.lengths[length].matrix[ids].tobytes().decode("ascii")
+        return [text[i : i + length] for i in range(0, len(text), length)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lists the words matching a pattern.")
+    parser.add_argument("pattern", help="Known letters and '_' for blanks, e.g. a_e__")
+    parser.add_argument("--excluded", default="", help="Letters not in the word.")
+    parser.add_argument("--words", default="words.txt", help="Word list.")
+    args = parser.parse_args()
+
+    patterns = PatternIndex(load_word_index(args.words))
+    patterns.get_length_index(len(args.pattern))  # Built before timing the query
+    start_time = time.perf_counter()
+    matches = patterns.query(args.pattern.lower(), args.excluded.lower())
+    elapsed = time.perf_counter() - start_time
+    print(", ".join(matches))
+    print(f"\n{len(matches)} words found in {elapsed * 1000:.3f} ms.")
@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+from collections import OrderedDict
+from collections.abc import Mapping
+
+"""
+Sharded word lists, for dictionaries too large to be held in memory (e.g. multi-language lists).
+
+The word list is streamed by chunks and split in one file per word length, '<length>.txt', plus a
+'manifest.json' with the number of words of each length and the stat of the source file. A game
+only loads the shard of the length it needs, on first request, and only the most recently used
+shards stay in memory, so the memory grows with the lengths actually played.
+
+Unlike word_index, any UTF-8 word list is supported: the lengths are counted in characters.
+"""
+
+MANIFEST = "manifest.json"
+
+
+def build_shards(source_path: str, directory: str, chunk_size: int = 1 << 20):
+    """
+    Splits a word list, one word per line, in one file per word length.
+
+    Args:
+        source_path (str): The word list.
+        directory (str): The directory of the shards, replaced if it exists.
+        chunk_size (int): Approximate number of bytes read at once.
+    """
+    stat = os.stat(source_path)
+    temporary_directory = directory + ".tmp"
+    shutil.rmtree(temporary_directory, ignore_errors=True)
+    os.makedirs(temporary_directory)
+
+    counts = {}
+    shards = {}  # Word length -> open shard file
+    try:
+        with open(source_path, "r", encoding="utf-8") as f:
+            while lines := f.readlines(chunk_size):
+                groups = {}
+                for line in lines:
+                    word = line.rstrip()
+                    groups.setdefault(len(word), []).append(word)
+                for length, words in groups.items():
+                    if length not in shards:
+                        shards[length] = open(
+                            os.path.join(temporary_directory, f"{length}.txt"),
+                            "w",
+                            encoding="utf-8",
+                        )
+                    shards[length].write("\n".join(words) + "\n")
+                    counts[length] = counts.get(length, 0) + len(words)
+    finally:
+        for shard in shards.values():
+            shard.close()
+
+    with open(os.path.join(temporary_directory, MANIFEST), "w") as f:
+        json.dump(
+            {
+                "source_size": stat.st_size,
+                "source_mtime_ns": stat.st_mtime_ns,
+                "counts": counts,
+            },
+            f,
+        )
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(temporary_directory, directory)
+
+
+def shards_are_fresh(source_path: str, directory: str):
+    """
+    Returns:
+        bool: True if the shards were built from the current word list.
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    stat = os.stat(source_path)
+    return (manifest["source_size"], manifest["source_mtime_ns"]) == (
+        stat.st_size,
+        stat.st_mtime_ns,
+    )
+
+
+class ShardedWords(Mapping):
+    """
+    Read-only mapping word length -> words of this length, as the dictionary of
+    create_word_length_dict, loading the shards on demand.
+    """
+
+    def __init__(self, directory: str, max_resident: int = 4):
+        """
+        Args:
+            directory (str): The directory of the shards, see build_shards.
+            max_resident (int): Maximum number of shards kept in memory.
+        """
+        self.directory = directory
+        self.max_resident = max_resident
+        with open(os.path.join(directory, MANIFEST)) as f:
+            self.counts = {
+                int(length): count for length, count in json.load(f)["counts"].items()
+            }
+        self.resident = OrderedDict()  # Word length -> words, least recently used first
+
+    def __getitem__(self, length):
+        if length not in self.counts:
+            raise KeyError(length)
+        if length in self.resident:
+            self.resident.move_to_end(length)
+            return self.resident[length]
+
+        with open(
+            os.path.join(self.directory, f"{length}.txt"), "r", encoding="utf-8"
+        ) as f:
+            words = f.read().splitlines()
+        self.resident[length] = words
+        if len(self.resident) > self.max_resident:
+            self.resident.popitem(last=False)
+        return words
+
+    def __contains__(self, length):
+        return length in self.counts
+
+    def __iter__(self):
+        return iter(sorted(self.counts))
+
+    def __len__(self):
+        return len(self.counts)
+
+
+def load_word_shards(
+    source_path: str = "words.txt", directory: str = None, max_resident: int = 4
+):
+    """
+    Opens the shards of a word list, splitting it first if it is missing or out of date.
+
+    Args:
+        source_path (str): The word list, one word per line.
+        directory (str): The directory of the shards, defaults to the word list path with a
+            '_shards' suffix.
+        max_resident (int): Maximum number of shards kept in memory.
+
+    Returns:
+        ShardedWords: The word lengths mapped to their words.
+    """
+    if directory is None:
+        directory = os.path.splitext(source_path)[0] + "_shards"
+    if not shards_are_fresh(source_path, directory):
+        build_shards(source_path, directory)
+    return ShardedWords(directory, max_resident)
@@ -0,0 +1,176 @@
+import json
+import math
+import os
+import numpy as np
+
+"""
+Online statistics of the number of attempts, for runs too long to keep every game in memory.
+
+An AttemptStats keeps a fixed-size histogram (one bin per number of attempts, the last bin
+collecting everything larger), the running mean and variance (Welford, merged with Chan's formula)
+and the extremes. Quantiles are read from the histogram: they are exact while the values stay
+below the last bin, and approximated by the maximum beyond it.
+
+Stats built by different worker processes are merged with merge(), and saved to / loaded from
+JSON checkpoints, so a long run can be resumed or plotted at any time.
+"""
+
+
+class AttemptStats:
+    """
+    Mergeable accumulator of non-negative integer samples.
+    """
+
+    def __init__(self, num_bins: int = 64):
+        """
+        Parameters:
+            num_bins: Number of histogram bins, values >= num_bins - 1 share the last one.
+        """
+        self.counts = np.zeros(num_bins, dtype=np.int64)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of the squared deviations from the mean
+        self.minimum = None
+        self.maximum = None
+
+    @classmethod
+    def from_values(cls, values, num_bins: int = 64):
+        """
+        Returns:
+            AttemptStats: The stats of a batch of values.
+        """
+        stats = cls(num_bins)
+        stats.update(values)
+        return stats
+
+    def update(self, values):
+        """
+        Adds a batch of values.
+
+        Parameters:
+            values: Iterable of non-negative integers.
+        """
+        values = np.asarray(values, dtype=np.int64).ravel()
+        if len(values) == 0:
+            return
+        batch = AttemptStats(len(self.counts))
+        batch.counts = np.bincount(
+            np.minimum(values, len(self.counts) - 1), minlength=len(self.counts)
+        )
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.minimum = int(values.min())
+        batch.maximum = int(values.max())
+        self.merge(batch)
+
+    def merge(self, other: "AttemptStats"):
+        """
+        Adds the samples of another accumulator, e.g. built by another process.
+
+        Raises:
+            ValueError: If the histograms do not have the same number of bins.
+        """
+        if len(other.counts) != len(self.counts):
+            raise ValueError("Cannot merge histograms with different numbers of bins")
+        if other.count == 0:
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta**2 * self.count * other.count / total
+        self.count = total
+        self.counts += other.counts
+        self.minimum = (
+            other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        )
+        self.maximum = (
+            other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        )
+        return self
+
+    def variance(self):
+        """
+        Returns:
+            float: The population variance, as np.var.
+        """
+        return self.m2 / self.count if self.count else math.nan
+
+    def std(self):
+        """
+        Returns:
+            float: The population standard deviation, as np.std.
+        """
+        return math.sqrt(self.variance())
+
+    def value_at_rank(self, rank: int):
+        """
+        Returns:
+            int: The value of the sample of the given rank in sorted order.
+        """
+        bin_index = int(np.searchsorted(np.cumsum(self.counts), rank, side="right"))
+        if bin_index >= len(self.counts) - 1:
+            return self.maximum  # Beyond the histogram, only the maximum is known
+        return bin_index
+
+    def quantile(self, q: float):
+        """
+        Interpolates between the closest ranks, as np.quantile with its default method.
+
+        Parameters:
+            q: Quantile between 0 and 1.
+        """
+        if self.count == 0:
+            return math.nan
+        position = q * (self.count - 1)
+        lower = self.value_at_rank(math.floor(position))
+        upper = self.value_at_rank(math.ceil(position))
+        return lower + (upper - lower) * (position - math.floor(position))
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def to_dict(self):
+        return {
+            "counts": self.counts.tolist(),
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        stats = cls(len(data["counts"]))
+        stats.counts = np.array(data["counts"], dtype=np.int64)
+        for name in ("count", "mean", "m2", "minimum", "maximum"):
+            setattr(stats, name, data[name])
+        return stats
+
+
+def save_checkpoint(path: str, stats: AttemptStats, **progress):
+    """
+    Writes the stats and the progress of a run, replacing the previous checkpoint atomically.
+
+    Parameters:
+        path: The JSON checkpoint file.
+        stats: The stats so far.
+        progress: Any JSON data needed to resume the run.
+    """
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w") as f:
+        json.dump({"stats": stats.to_dict(), "progress": progress}, f)
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path: str):
+    """
+    Returns:
+        stats: The saved AttemptStats.
+        progress: The saved progress dictionary.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    return AttemptStats.from_dict(data["stats"]), data["progress"]
@@ -1,8 +1,12 @@
-import matplotlib.pyplot as plt
-import numpy as np
+import os
 import random
 import time
 
+from mastermind_feedback import CODE_LENGTH, WIN_FEEDBACK, answer_symbols, feedback_code
+
+# NumPy (through mastermind_solver), matplotlib and the process pool are imported by the functions that need them,
+# so an interactive game with the 'digits' strategy starts without loading them.
+
 """"
 Name of the game: MindReader (Mastermind)
 
@@ -181,32 +185,17 @@ def check_guess(seq_to_guess: list, guess: list):
 
     Return:
         seq_answer: Sequence containing '✅', '⛔' or '❌' based on matching of user input with the number to guess.
-
-    Raises:
-        IndexError: If the player give more than a 4-digit number.
     """
+    if len(guess) > CODE_LENGTH:
+        print(
+            """
+            You have given a number too large !! 
+            Excess numbers won't be taken into account !
+            """
+        )
 
-    seq_answer = ["❌", "❌", "❌", "❌"]
-
-    for place, number in enumerate(guess):
-        try:
-            # check appartenance
-            if number in seq_to_guess:
-                # check place
-                if number == seq_to_guess[place]:
-                    seq_answer[place] = "✅"
-                else:
-                    seq_answer[place] = "⛔"
-
-        except IndexError:
-            print(
-                """
-                You have given a number too large !! 
-                Excess numbers won't be taken into account !
-                """
-            )
-
-    return seq_answer
+    # The feedback is computed as an integer, the symbols are only built to be displayed
+    return answer_symbols(feedback_code(seq_to_guess, guess))
 
 
 def game_ending(result: str, player_name: str, num_attempt: int, seq_to_guess: list):
@@ -246,15 +235,39 @@ def game_ending(result: str, player_name: str, num_attempt: int, seq_to_guess: l
         )
 
 
-def main_game(num_attempt=-1):
+def generate_sequence():
+    """
+    Picks the number to guess.
+
+    Return:
+        seq_to_guess: The 4-digit number as a list of digits characters, all digits are unique.
+    """
+    # Check that all numbers in the number to guess are unique.
+    while True:
+        seq_to_guess = list(str(random.randint(1000, 9999)))
+
+        if len(seq_to_guess) == len(set(seq_to_guess)):
+            return seq_to_guess
+
+
+def main_game(num_attempt=-1, strategy="consistent"):
     """
     Main function for the game.
 
     Parameters:
         num_attempts (default to 5): Number of attempts. Set it to 0 or anything negative to play until the number is guessed.
+        strategy (default to 'consistent'): 'consistent' to only play codes matching every previous answer,
+            'minimax', 'entropy' or 'partitions' to pick the guess splitting best the possible codes
+            (see mastermind_solver), 'tree' to replay the precomputed decision tree of mastermind.tree,
+            'digits' for the digit by digit guess function.
     """
     previous_guess = None
     choices = list(map(str, list(range(10))))
+    solver = None
+    if strategy != "digits":
+        from mastermind_solver import code_sequence, make_solver
+
+        solver = make_solver(strategy)
 
     cpt_attempts = 0
     lasting_attempts = num_attempt
@@ -264,12 +277,7 @@ def main_game(num_attempt=-1):
 
     game_opening(name=player_name)
 
-    # Check that all numbers in the number to guess are unique.
-    while True:
-        seq_to_guess = list(str(random.randint(1000, 9999)))
-
-        if len(seq_to_guess) == len(set(seq_to_guess)):
-            break
+    seq_to_guess = generate_sequence()
 
     print(
         f"""
@@ -283,16 +291,21 @@ def main_game(num_attempt=-1):
     start_time = time.time()
 
     while True:
-        choices, player_guess = guess(previous_guess, choices, seq_answer)
+        if solver is not None:
+            guess_index = solver.next_guess()
+            player_guess = code_sequence(guess_index)
+        else:
+            choices, player_guess = guess(previous_guess, choices, seq_answer)
 
         print(f"{player_name} tries this sequence : {player_guess}")
 
         player_guess = [i for i in player_guess]
-        seq_answer = check_guess(seq_to_guess, player_guess)
+        feedback = feedback_code(seq_to_guess, player_guess)
+        seq_answer = answer_symbols(feedback)
 
         print(seq_answer)
 
-        if seq_answer == ["✅", "✅", "✅", "✅"]:
+        if feedback == WIN_FEEDBACK:
             end_time = time.time()
             game_ending(
                 result="good",
@@ -311,6 +324,8 @@ def main_game(num_attempt=-1):
             lasting_attempts -= 1
             cpt_attempts += 1
             previous_guess = player_guess
+            if solver is not None:
+                solver.update(guess_index, feedback)
             if lasting_attempts == 0:
                 end_time = time.time()
                 game_ending(
@@ -330,23 +345,273 @@ def main_game(num_attempt=-1):
         # time.sleep(0.3)
 
 
+def headless_game(num_attempt=-1, strategy="consistent"):
+    """
+    Quiet version of main_game, for benchmarks: same rules and same returned count, but nothing is printed.
+
+    Parameters:
+        num_attempts: Number of attempts. Set it to 0 or anything negative to play until the number is guessed.
+        strategy: See main_game.
+
+    Return:
+        cpt_attempts: Number of wrong guesses before finding the number.
+    """
+    cpt_attempts = 0
+    lasting_attempts = num_attempt
+    seq_to_guess = generate_sequence()
+
+    if strategy == "digits":
+        return headless_digits_game(seq_to_guess, num_attempt)
+
+    from mastermind_solver import code_index, feedback_matrix, make_solver
+
+    # Integers only: code indices and feedback codes looked up in the feedback matrix
+    solver = make_solver(strategy)
+    matrix = feedback_matrix()
+    secret = code_index(seq_to_guess)
+
+    while True:
+        guess_index = solver.next_guess()
+        feedback = int(matrix[guess_index, secret])
+        if feedback == WIN_FEEDBACK:
+            return cpt_attempts
+
+        lasting_attempts -= 1
+        cpt_attempts += 1
+        solver.update(guess_index, feedback)
+        if lasting_attempts == 0:
+            return cpt_attempts
+
+
+def headless_digits_game(seq_to_guess, num_attempt=-1):
+    """
+    headless_game with the digit by digit guess function.
+
+    Parameters:
+        seq_to_guess: The sequence to guess.
+        num_attempts: See headless_game.
+
+    Return:
+        cpt_attempts: Number of wrong guesses before finding the number.
+    """
+    previous_guess = None
+    choices = list(map(str, list(range(10))))
+    cpt_attempts = 0
+    lasting_attempts = num_attempt
+    seq_answer = None
+
+    while True:
+        choices, player_guess = guess(previous_guess, choices, seq_answer)
+        feedback = feedback_code(seq_to_guess, player_guess)
+        if feedback == WIN_FEEDBACK:
+            return cpt_attempts
+
+        seq_answer = answer_symbols(feedback)  # The guess function reads the symbols
+        lasting_attempts -= 1
+        cpt_attempts += 1
+        previous_guess = player_guess
+        if lasting_attempts == 0:
+            return cpt_attempts
+
+
+def run_rounds(num_rounds, strategy, seed):
+    """
+    Plays headless games in a worker process.
+
+    Parameters:
+        num_rounds: Number of games to play.
+        strategy: See main_game.
+        seed: Seed of the random module for these games.
+
+    Return:
+        np.ndarray: Number of attempts of each game.
+    """
+    import numpy as np
+
+    random.seed(seed)
+    return np.array(
+        [headless_game(num_attempt=-1, strategy=strategy) for _ in range(num_rounds)],
+        dtype=np.int32,
+    )
+
+
+def run_stats(num_rounds, strategy, seed):
+    """
+    Plays headless games in a worker process and only sends back their stats.
+
+    Parameters:
+        See run_rounds.
+
+    Return:
+        AttemptStats: Stats of the number of attempts, see attempt_stats.
+    """
+    from attempt_stats import AttemptStats
+
+    return AttemptStats.from_values(run_rounds(num_rounds, strategy, seed))
+
+
+def plan_batches(num_rounds, batch_size, entropy):
+    """
+    Splits a run in batches of games, each with its own seed.
+
+    Parameters:
+        num_rounds: Total number of games.
+        batch_size: Number of games per batch.
+        entropy: Seed of the run, see np.random.SeedSequence.
+
+    Return:
+        batch_sizes: Number of games of each batch.
+        seeds: Seed of the random module for each batch.
+    """
+    import numpy as np
+
+    batch_sizes = [
+        min(batch_size, num_rounds - start)
+        for start in range(0, num_rounds, batch_size)
+    ]
+    seeds = [
+        int(child.generate_state(1)[0])
+        for child in np.random.SeedSequence(entropy).spawn(len(batch_sizes))
+    ]
+    return batch_sizes, seeds
+
+
+def play_batches(function, batch_sizes, strategy, seeds, workers):
+    """
+    Maps a batch function over a pool of processes.
+
+    Return:
+        iterator: The result of each batch, in order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if strategy != "digits":
+        from mastermind_solver import feedback_matrix
+
+        feedback_matrix()  # Built before forking, so the workers can share it
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        yield from executor.map(
+            function, batch_sizes, [strategy] * len(batch_sizes), seeds
+        )
+
+
+def benchmark(
+    num_rounds, strategy="consistent", workers=None, seed=None, batch_size=250
+):
+    """
+    Plays many headless games, split across a pool of processes.
+
+    Parameters:
+        num_rounds: Total number of games.
+        strategy: See main_game.
+        workers: Number of processes, defaults to the number of CPUs.
+        seed: Seed for reproducible runs, each batch of games gets its own seed derived from it,
+            so the result does not depend on the number of workers.
+        batch_size: Number of games per task sent to the workers.
+
+    Return:
+        np.ndarray: Number of attempts of each game.
+    """
+    import numpy as np
+
+    batch_sizes, seeds = plan_batches(num_rounds, batch_size, seed)
+    return np.concatenate(
+        list(play_batches(run_rounds, batch_sizes, strategy, seeds, workers))
+    )
+
+
+def benchmark_stats(
+    num_rounds,
+    strategy="consistent",
+    workers=None,
+    seed=None,
+    batch_size=250,
+    checkpoint=None,
+    checkpoint_every=100,
+):
+    """
+    Same games as benchmark, but only their stats are kept, for runs of any length.
+
+    Parameters:
+        num_rounds, strategy, workers, seed, batch_size: See benchmark.
+        checkpoint: Path of a JSON checkpoint. If it exists, the run is resumed from it.
+        checkpoint_every: Number of batches between two checkpoints.
+
+    Return:
+        AttemptStats: Stats of the number of attempts, see attempt_stats.
+
+    Raises:
+        ValueError: If the checkpoint was saved by a different run.
+    """
+    import numpy as np
+    from attempt_stats import AttemptStats, load_checkpoint, save_checkpoint
+
+    run = {"num_rounds": num_rounds, "strategy": strategy, "batch_size": batch_size}
+    stats = AttemptStats()
+    # The seed is saved, so a resumed run plays the same games as an uninterrupted one
+    entropy = np.random.SeedSequence(seed).entropy
+    batches_done = 0
+
+    if checkpoint is not None and os.path.exists(checkpoint):
+        stats, progress = load_checkpoint(checkpoint)
+        if progress["run"] != run:
+            raise ValueError(
+                f"{checkpoint} was saved by another run: {progress['run']}"
+            )
+        entropy = progress["entropy"]
+        batches_done = progress["batches_done"]
+
+    batch_sizes, seeds = plan_batches(num_rounds, batch_size, entropy)
+    results = play_batches(
+        run_stats,
+        batch_sizes[batches_done:],
+        strategy,
+        seeds[batches_done:],
+        workers,
+    )
+    for batch_stats in results:
+        stats.merge(batch_stats)
+        batches_done += 1
+        if checkpoint is not None and (
+            batches_done % checkpoint_every == 0 or batches_done == len(batch_sizes)
+        ):
+            save_checkpoint(
+                checkpoint,
+                stats,
+                run=run,
+                entropy=entropy,
+                batches_done=batches_done,
+            )
+
+    return stats
+
+
 def plot_result(attempts, filename="auto_mastermind_result.png"):
     """
     Plots the histogram of the number of attempts taken to guess the correct number.
 
     Parameters:
-        attempts (list): A list of integers representing the number of attempts.
+        attempts (list or AttemptStats): A list of integers representing the number of attempts,
+            or their stats (see attempt_stats) for runs too long to keep every game.
         filename (str): The name of the file to save the plot as an image.
     """
+    import matplotlib.pyplot as plt
+    from attempt_stats import AttemptStats
+
+    if not isinstance(attempts, AttemptStats):
+        attempts = AttemptStats.from_values(attempts)
+    max_attempts = attempts.maximum
 
     # Create a new figure with a specified size
     plt.figure(figsize=(14, 12))
 
-    # Create a histogram of attempts
-    plt.hist(
-        attempts,
-        bins=range(1, max(attempts) + 2),
-        align="left",
+    # Create a histogram of attempts, from the counts of the stats
+    shown = range(1, min(max_attempts, len(attempts.counts) - 1) + 1)
+    plt.bar(
+        shown,
+        attempts.counts[shown.start : shown.stop],
+        width=1,
         color="skyblue",
         edgecolor="black",
     )
@@ -357,14 +622,14 @@ def plot_result(attempts, filename="auto_mastermind_result.png"):
     plt.ylabel("Frequency")
 
     # Set x-ticks to show each attempt number
-    plt.xticks(range(1, max(attempts) + 1))
+    plt.xticks(range(1, max_attempts + 1))
 
     # Add grid lines for better readability
     plt.grid(axis="y", alpha=0.75)
 
     # Annotate the plot with the mean and median attempts
-    mean_attempts = np.mean(attempts)
-    median_attempts = np.median(attempts)
+    mean_attempts = attempts.mean
+    median_attempts = attempts.median()
 
     plt.text(
         0.5,
@@ -396,10 +661,13 @@ if __name__ == "__main__":
     formatted_time = time.strftime("%Y-%m-%d_%H-%M-%S")
 
     num_rounds = 10000
-    all_attempts = []
-
-    for _ in range(num_rounds):
-        num_attempts = main_game(num_attempt=-1)
-        all_attempts.append(num_attempts)
+    start_time = time.time()
+    # Pass the checkpoint of an interrupted run instead to resume it
+    stats = benchmark_stats(
+        num_rounds,
+        strategy="consistent",
+        checkpoint=f"auto_mastermind_stats_{formatted_time}.json",
+    )
+    print(f"{num_rounds} games played in {time.time() - start_time:.2f} seconds.")
 
-    plot_result(all_attempts, filename=f"auto_mastermind_result_{formatted_time}.png")
+    plot_result(stats, filename=f"auto_mastermind_result_{formatted_time}.png")
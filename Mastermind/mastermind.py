@@ -1,6 +1,8 @@
 import random
 import time
 
+from mastermind_feedback import CODE_LENGTH, WIN_FEEDBACK, answer_symbols, feedback_code
+
 """"
 Name of the game: Mindreader (Mastermind)
 
@@ -60,33 +62,17 @@ def check_guess(seq_to_guess: list, guess: list):
         guess: The user guess.
 
     Return:
-        seq_answer: Sequence containing '✅', '⛔' or '❌' based on matching of user input with the number to guess.
-
-    Raises:
-        IndexError: If the player give more than a 4-digit number.
+        feedback: The feedback code of the guess, see answer_symbols for its '✅', '⛔' or '❌' display.
     """
+    if len(guess) > CODE_LENGTH:
+        print(
+            """
+              You have given a number too large !! 
+              Excess numbers won't be taken into account !
+              """
+        )
 
-    seq_answer = ["❌", "❌", "❌", "❌"]
-
-    for place, number in enumerate(guess):
-        try:
-            # check appartenance
-            if number in seq_to_guess[:5]:
-                # check place
-                if number == seq_to_guess[place]:
-                    seq_answer[place] = "✅"
-                else:
-                    seq_answer[place] = "⛔"
-
-        except IndexError:
-            print(
-                """
-                  You have given a number too large !! 
-                  Excess numbers won't be taken into account !
-                  """
-            )
-
-    return seq_answer
+    return feedback_code(seq_to_guess, guess)
 
 
 def game_ending(result: str, player_name: str, num_attempt: int, seq_to_guess: list):
@@ -156,11 +142,12 @@ def main_game(num_attempt=5):
 
     while True:
         player_guess = [i for i in input("Please make your guess 🤖: ")]
-        seq_answer = check_guess(seq_to_guess, player_guess)
+        feedback = check_guess(seq_to_guess, player_guess)
 
-        print(seq_answer)
+        # The feedback is compared as an integer, the symbols are only built to be displayed
+        print(answer_symbols(feedback))
 
-        if seq_answer == ["✅", "✅", "✅", "✅"]:
+        if feedback == WIN_FEEDBACK:
             end_time = time.time()
             game_ending(
                 result="good",
@@ -0,0 +1,233 @@
+import argparse
+import collections
+import itertools
+import math
+import random
+import time
+import numpy as np
+
+"""
+Generalized Mastermind engine: configurable code length, number of symbols and repetitions.
+
+Codes are tuples of symbols 0 to num_symbols - 1. The feedback of a guess is given as the classic
+(black, white) pegs: black for the symbols at the right place, white for the symbols of the
+secret placed at a wrong place. It is encoded as the integer black * (length + 1) + white.
+
+The space of codes is never materialized: codes are generated lazily with itertools and scored
+by batches, so the memory stays bounded even for large spaces (e.g. 10^6 codes for length 6,
+10 symbols and repetitions).
+
+The engine is standalone: mastermind.py, auto_mastermind.py, mastermind_solver.py and the
+codebreaker service do not use it. Their Mindreader rules answer each place of the guess with
+'✅', '⛔' or '❌' (see mastermind_feedback), which tells which digits are well placed, where the
+pegs only count them: the 4-digit games are not a configuration of these rules. Their 5040 codes
+also fit in the precomputed feedback matrix of mastermind_solver, which this engine avoids so it
+can handle spaces of millions of codes.
+"""
+
+
+class MastermindEngine:
+    """
+    Rules of a Mastermind game.
+    """
+
+    def __init__(self, length: int = 4, num_symbols: int = 10, repeats: bool = False):
+        """
+        Parameters:
+            length: Number of places of a code.
+            num_symbols: Number of symbols available, at most 256.
+            repeats: True if a symbol can be used several times in a code.
+
+        Raises:
+            ValueError: If the rules do not allow any code.
+        """
+        if not 0 < num_symbols <= 256:
+            raise ValueError("The number of symbols should be between 1 and 256")
+        if length < 1 or (not repeats and length > num_symbols):
+            raise ValueError(
+                f"No code of length {length} with {num_symbols} unique symbols"
+            )
+        self.length = length
+        self.num_symbols = num_symbols
+        self.repeats = repeats
+
+    def num_codes(self):
+        """
+        Returns:
+            int: The size of the code space.
+        """
+        if self.repeats:
+            return self.num_symbols**self.length
+        return math.perm(self.num_symbols, self.length)
+
+    def codes(self):
+        """
+        Generates every code lazily, in lexicographic order.
+        """
+        if self.repeats:
+            return itertools.product(range(self.num_symbols), repeat=self.length)
+        return itertools.permutations(range(self.num_symbols), self.length)
+
+    def code_batches(self, batch_size: int = 4096):
+        """
+        Generates every code, in lexicographic order, by uint8 arrays of batch_size x length.
+        """
+        codes = self.codes()
+        while batch := list(itertools.islice(codes, batch_size)):
+            yield np.array(batch, dtype=np.uint8)
+
+    def random_code(self):
+        """
+        Returns:
+            tuple: A random code.
+        """
+        if self.repeats:
+            return tuple(random.choices(range(self.num_symbols), k=self.length))
+        return tuple(random.sample(range(self.num_symbols), self.length))
+
+    def feedback(self, guess: tuple, secret: tuple):
+        """
+        Computes the pegs of a guess.
+
+        Returns:
+            tuple: (black, white) pegs.
+        """
+        black = sum(g == s for g, s in zip(guess, secret))
+        common = collections.Counter(guess) & collections.Counter(secret)
+        return black, sum(common.values()) - black
+
+    def encode(self, pegs: tuple):
+        """
+        Returns:
+            int: The feedback code of (black, white) pegs.
+        """
+        black, white = pegs
+        return black * (self.length + 1) + white
+
+    def decode(self, feedback: int):
+        """
+        Returns:
+            tuple: The (black, white) pegs of a feedback code.
+        """
+        return divmod(int(feedback), self.length + 1)
+
+    def winning_feedback(self):
+        """
+        Returns:
+            int: The feedback code of a guess equal to the secret.
+        """
+        return self.encode((self.length, 0))
+
+    def feedback_many(self, guess: tuple, secrets: np.ndarray):
+        """
+        Computes the feedback codes of a guess against a batch of secrets.
+
+        Parameters:
+            guess: The guess.
+            secrets: uint8 array of num_secrets x length codes.
+
+        Returns:
+            np.ndarray: The feedback code of each secret.
+        """
+        guess = np.asarray(guess, dtype=np.uint8)
+        black = (secrets == guess).sum(axis=1)
+
+        if self.repeats:
+            # Common symbols: sum over the symbols of the smallest number of occurrences
+            symbols = np.arange(self.num_symbols, dtype=np.uint8)
+            secret_counts = (secrets[:, :, None] == symbols).sum(axis=1)
+            guess_counts = np.bincount(guess, minlength=self.num_symbols)
+            common = np.minimum(secret_counts, guess_counts).sum(axis=1)
+        else:
+            # Unique symbols: a symbol of the guess is common if it is anywhere in the secret
+            common = (secrets[:, :, None] == guess).any(axis=1).sum(axis=1)
+
+        return black * (self.length + 1) + (common - black)
+
+
+class StreamingSolver:
+    """
+    Plays the first code, in lexicographic order, consistent with every feedback received.
+
+    The codes are streamed in batches: a code rejected once stays rejected, so the stream is
+    resumed where the previous guess was found and a whole game reads the code space at most once.
+    """
+
+    def __init__(self, engine: MastermindEngine, batch_size: int = 4096):
+        self.engine = engine
+        self.batches = engine.code_batches(batch_size)
+        self.batch = np.empty((0, engine.length), dtype=np.uint8)
+        self.history = []  # (guess, feedback code) pairs
+
+    def next_guess(self):
+        """
+        Returns:
+            tuple: The next guess.
+
+        Raises:
+            ValueError: If no code is consistent with the feedbacks received.
+        """
+        while True:
+            consistent = np.ones(len(self.batch), dtype=bool)
+            for guess, feedback in self.history:
+                consistent &= self.engine.feedback_many(guess, self.batch) == feedback
+            self.batch = self.batch[consistent]
+
+            if len(self.batch):
+                guess = tuple(int(symbol) for symbol in self.batch[0])
+                self.batch = self.batch[1:]
+                return guess
+
+            self.batch = next(self.batches, None)
+            if self.batch is None:
+                raise ValueError("No code is consistent with the feedbacks received")
+
+    def update(self, guess: tuple, pegs: tuple):
+        """
+        Parameters:
+            guess: The guess played.
+            pegs: The (black, white) pegs received.
+        """
+        self.history.append((guess, self.engine.encode(pegs)))
+
+
+def solve(engine: MastermindEngine, secret: tuple, batch_size: int = 4096):
+    """
+    Plays a StreamingSolver against a secret.
+
+    Returns:
+        list: The guesses played, the last one being the secret.
+    """
+    solver = StreamingSolver(engine, batch_size)
+    guesses = []
+    while True:
+        guess = solver.next_guess()
+        guesses.append(guess)
+        if guess == tuple(secret):
+            return guesses
+        solver.update(guess, engine.feedback(guess, secret))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Solves random secrets of a generalized Mastermind game."
+    )
+    parser.add_argument("--length", type=int, default=6, help="Code length.")
+    parser.add_argument("--symbols", type=int, default=10, help="Number of symbols.")
+    parser.add_argument(
+        "--repeats", action="store_true", help="Allow repeated symbols."
+    )
+    parser.add_argument("--games", type=int, default=10, help="Number of games.")
+    args = parser.parse_args()
+
+    engine = MastermindEngine(args.length, args.symbols, args.repeats)
+    print(f"🤖 : {engine.num_codes()} possible codes.")
+
+    all_guesses = []
+    start_time = time.time()
+    for _ in range(args.games):
+        all_guesses.append(len(solve(engine, engine.random_code())))
+    print(
+        f"🤖 : {args.games} games solved in {time.time() - start_time:.2f} seconds, "
+        f"{np.mean(all_guesses):.2f} guesses in average, {max(all_guesses)} at worst."
+    )
@@ -0,0 +1,52 @@
+"""
+Feedback of the 4-digit Mindreader (Mastermind) game as a single integer.
+
+Each place of the guess is worth 0 for '❌', 1 for '⛔' and 2 for '✅', read as a base 3 number
+with the first place as the lowest digit. There are 3^4 = 81 feedbacks, so they fit in a uint8.
+The '✅', '⛔' and '❌' symbols are only produced to be displayed.
+"""
+
+CODE_LENGTH = 4
+ANSWER_SYMBOLS = ("❌", "⛔", "✅")
+ANSWER_VALUES = {symbol: value for value, symbol in enumerate(ANSWER_SYMBOLS)}
+PLACE_WEIGHTS = tuple(3**place for place in range(CODE_LENGTH))
+WIN_FEEDBACK = 2 * sum(PLACE_WEIGHTS)
+
+
+def feedback_code(seq_to_guess: list, guess: list):
+    """
+    Computes the feedback of a guess, only its first 4 places are taken into account.
+
+    Parameters:
+        seq_to_guess: The sequence to guess.
+        guess: The guess.
+
+    Return:
+        int: The feedback code.
+    """
+    feedback = 0
+    for place, number in enumerate(guess[:CODE_LENGTH]):
+        # check appartenance, then place
+        if number in seq_to_guess:
+            value = 2 if number == seq_to_guess[place] else 1
+            feedback += value * PLACE_WEIGHTS[place]
+    return feedback
+
+
+def answer_symbols(feedback: int):
+    """
+    Return:
+        seq_answer: Sequence containing '✅', '⛔' or '❌' for a feedback code.
+    """
+    return [ANSWER_SYMBOLS[feedback // weight % 3] for weight in PLACE_WEIGHTS]
+
+
+def encode_answer(seq_answer: list):
+    """
+    Return:
+        int: The feedback code of a sequence containing '✅', '⛔' or '❌'.
+    """
+    return sum(
+        ANSWER_VALUES[answer] * weight
+        for answer, weight in zip(seq_answer, PLACE_WEIGHTS)
+    )
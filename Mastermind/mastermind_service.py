@@ -0,0 +1,298 @@
+import argparse
+import asyncio
+import functools
+import itertools
+import sys
+from collections import OrderedDict
+import numpy as np
+
+from mastermind_feedback import ANSWER_VALUES, CODE_LENGTH, WIN_FEEDBACK, encode_answer
+from mastermind_solver import (
+    STRATEGIES,
+    all_codes,
+    choose_guess,
+    code_sequence,
+    feedback_matrix,
+)
+
+"""
+Codebreaker service: the Mastermind solvers as a backend for many concurrent games.
+
+Every session only keeps its candidate codes as a bitset (a Python int whose bit i is set while
+the code of index i is possible, about 650 bytes) and the last guess. The feedback matrix is
+built once and shared read-only by all the sessions. The guesses of the optimizing strategies are
+computed in worker threads, so a slow guess never blocks the other games.
+
+Line protocol, one request per line, over TCP or stdin/stdout:
+    new [strategy]              -> '<session> <guess>'
+    guess <session> <feedback>  -> '<guess>', 'won' once the feedback is a win
+    close <session>             -> 'ok'
+The sessions a connection opened and left unfinished are dropped when it closes.
+The feedback is the answer to the last guess, either as its integer code (see mastermind_feedback)
+or as the 4 symbols, e.g. '✅⛔❌❌'. Errors are answered with 'error <message>'.
+
+Usage:
+    python mastermind_service.py --port 8765
+    python mastermind_service.py --stdio
+"""
+
+ALL_CANDIDATES = (1 << len(all_codes())) - 1
+
+
+@functools.lru_cache(maxsize=16384)
+def feedback_bitset(guess: int, feedback: int):
+    """
+    Returns:
+        int: Bitset of the codes that give this feedback to this guess.
+    """
+    row = feedback_matrix()[guess] == feedback
+    return int.from_bytes(np.packbits(row, bitorder="little").tobytes(), "little")
+
+
+def bitset_indices(bits: int):
+    """
+    Returns:
+        np.ndarray: The indices of the set bits, in increasing order.
+    """
+    data = np.frombuffer(bits.to_bytes(-(-len(all_codes()) // 8), "little"), np.uint8)
+    return np.flatnonzero(np.unpackbits(data, bitorder="little"))
+
+
+class GuessCache:
+    """
+    Guesses of the optimizing strategies, shared by the sessions reaching the same candidates.
+
+    choose_guess takes milliseconds on large candidate sets: a missing guess is computed in a
+    worker thread so the event loop keeps serving the other games, and the sessions asking for a
+    guess being computed wait for the same future. Only the most recently used are kept, and a
+    guess which failed is not kept at all.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        # (strategy, bits, num_guesses) -> future of the guess
+        self.futures = OrderedDict()
+
+    def forget_failed(self, key: tuple, future):
+        """Drops a guess which raised, so the next request computes it again."""
+        if future.cancelled() or future.exception() is not None:
+            if self.futures.get(key) is future:
+                del self.futures[key]
+
+    async def get(self, strategy: str, bits: int, num_guesses: int):
+        """
+        Returns:
+            int: choose_guess on the codes of a bitset.
+        """
+        key = (strategy, bits, num_guesses)
+        future = self.futures.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(
+                None, choose_guess, strategy, bitset_indices(bits), num_guesses
+            )
+            self.futures[key] = future
+            future.add_done_callback(functools.partial(self.forget_failed, key))
+            if len(self.futures) > self.max_size:
+                self.futures.popitem(last=False)
+        else:
+            self.futures.move_to_end(key)
+        # Shielded: a closed connection must not cancel a guess other sessions wait for
+        return await asyncio.shield(future)
+
+
+class Session:
+    """
+    State of one game: the remaining candidates and the last guess served.
+    """
+
+    __slots__ = ("strategy", "candidates", "guess", "num_guesses")
+
+    def __init__(self, strategy: str):
+        self.strategy = strategy
+        self.candidates = ALL_CANDIDATES
+        self.num_guesses = 0
+        self.guess = None
+
+    def narrow(self, feedback: int):
+        """
+        Parameters:
+            feedback: The feedback to the last guess.
+
+        Returns:
+            int: Bitset of the candidates consistent with it, the session is not changed.
+
+        Raises:
+            ValueError: If no code is consistent with the feedbacks received.
+        """
+        candidates = self.candidates & feedback_bitset(self.guess, feedback)
+        if candidates == 0:
+            raise ValueError("no code matches the feedbacks")
+        return candidates
+
+    def advance(self, candidates: int, guess: int):
+        """Moves to the next turn, once its guess is chosen."""
+        self.candidates = candidates
+        self.num_guesses += 1
+        self.guess = guess
+
+
+def parse_feedback(text: str):
+    """
+    Parameters:
+        text: Integer feedback code or the 4 answer symbols.
+
+    Returns:
+        int: The feedback code.
+
+    Raises:
+        ValueError: If the text is not a valid feedback.
+    """
+    if text.isdigit() and int(text) <= WIN_FEEDBACK:
+        return int(text)
+    if len(text) == CODE_LENGTH and all(symbol in ANSWER_VALUES for symbol in text):
+        return encode_answer(text)
+    raise ValueError(f"invalid feedback: {text}")
+
+
+class CodebreakerService:
+    """
+    Sessions of the service, shared by all its connections.
+    """
+
+    def __init__(self):
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+        self.guesses = GuessCache()
+        feedback_matrix()  # Built once, before the first request
+
+    async def next_guess(self, strategy: str, candidates: int, num_guesses: int):
+        """
+        Returns:
+            int: The index of the guess of a strategy on a bitset of candidates.
+        """
+        if strategy == "consistent":
+            # Lowest candidate, as mastermind_solver.choose_guess
+            return (candidates & -candidates).bit_length() - 1
+        return await self.guesses.get(strategy, candidates, num_guesses)
+
+    def close_session(self, session_id: int, opened: set = None):
+        """Forgets a session, finished or closed by its client."""
+        self.sessions.pop(session_id, None)
+        if opened is not None:
+            opened.discard(session_id)
+
+    async def handle(self, line: str, opened: set = None):
+        """
+        Answers one request line, see the protocol at the top of this module.
+
+        Parameters:
+            line: The request line.
+            opened: The ids of the sessions opened by the connection, kept up to date.
+
+        Returns:
+            str: The response line.
+        """
+        command, *args = line.split()
+        try:
+            if command == "new":
+                strategy = args[0] if args else "consistent"
+                if strategy not in STRATEGIES:
+                    raise ValueError(f"unknown strategy: {strategy}")
+                session = Session(strategy)
+                session.guess = await self.next_guess(strategy, session.candidates, 0)
+                session_id = next(self.session_ids)
+                self.sessions[session_id] = session
+                if opened is not None:
+                    opened.add(session_id)
+                return f"{session_id} {''.join(code_sequence(session.guess))}"
+
+            if command == "guess":
+                session_id = int(args[0])
+                session = self.sessions[session_id]
+                feedback = parse_feedback(args[1])
+                if feedback == WIN_FEEDBACK:
+                    self.close_session(session_id, opened)
+                    return "won"
+                candidates = session.narrow(feedback)
+                guess = await self.next_guess(
+                    session.strategy, candidates, session.num_guesses + 1
+                )
+                session.advance(candidates, guess)
+                return "".join(code_sequence(guess))
+
+            if command == "close":
+                self.close_session(int(args[0]), opened)
+                return "ok"
+
+            raise ValueError(f"unknown command: {command}")
+        except KeyError:
+            return f"error unknown session: {args[0]}"
+        except IndexError:
+            return f"error missing argument for {command}"
+        except ValueError as e:
+            return f"error {e}"
+
+    async def serve_stream(self, reader, write):
+        """
+        Answers the request lines of a stream until it is closed, then drops the sessions it
+        opened and left unfinished, so the games of disconnected clients are not kept forever.
+        """
+        opened = set()
+        try:
+            while line := await reader.readline():
+                line = line.decode().strip()
+                if line:
+                    await write(await self.handle(line, opened) + "\n")
+        finally:
+            for session_id in opened:
+                self.sessions.pop(session_id, None)
+
+    async def handle_connection(self, reader, writer):
+        async def write(response):
+            writer.write(response.encode())
+            await writer.drain()
+
+        try:
+            await self.serve_stream(reader, write)
+        finally:
+            writer.close()
+
+    async def serve_tcp(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"🤖 : Codebreaker service listening on {host}:{port}.")
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+        )
+
+        async def write(response):
+            sys.stdout.write(response)
+            sys.stdout.flush()
+
+        await self.serve_stream(reader, write)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serves Mastermind guesses to many concurrent games."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host.")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port.")
+    parser.add_argument(
+        "--stdio", action="store_true", help="Serve stdin/stdout instead of TCP."
+    )
+    args = parser.parse_args()
+
+    service = CodebreakerService()
+    try:
+        if args.stdio:
+            asyncio.run(service.serve_stdio())
+        else:
+            asyncio.run(service.serve_tcp(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
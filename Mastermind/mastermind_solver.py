@@ -0,0 +1,273 @@
+import functools
+import itertools
+import random
+import numpy as np
+
+from mastermind_feedback import CODE_LENGTH, PLACE_WEIGHTS
+
+"""
+Solver for the 4-digit Mindreader (Mastermind) game, where all digits are unique.
+
+The solvers work on integers only: the feedback of a guess is the code of mastermind_feedback,
+and all the 5040 valid codes are numbered in lexicographic order. The feedback of every
+(guess, secret) pair is precomputed once in a 5040 x 5040 uint8 matrix.
+"""
+
+NUM_DIGITS = 10
+STRATEGIES = ("consistent", "minimax", "entropy", "partitions")
+
+
+@functools.lru_cache(maxsize=None)
+def all_codes():
+    """
+    Returns:
+        np.ndarray: 5040 x 4 uint8 array of all the codes with unique digits, in lexicographic order.
+    """
+    return np.array(
+        list(itertools.permutations(range(NUM_DIGITS), CODE_LENGTH)), dtype=np.uint8
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def code_numbers():
+    """
+    Returns:
+        np.ndarray: Array mapping a 4-digit number (e.g. 123 for '0123') to its code index, -1 if invalid.
+    """
+    numbers = np.full(NUM_DIGITS**CODE_LENGTH, -1, dtype=np.int32)
+    weights = NUM_DIGITS ** np.arange(CODE_LENGTH - 1, -1, -1)
+    numbers[all_codes() @ weights] = np.arange(len(all_codes()))
+    return numbers
+
+
+def code_index(sequence: list):
+    """
+    Finds the index of a code.
+
+    Parameters:
+        sequence: The code as a list of digits characters, e.g. ['0', '1', '2', '3'].
+
+    Returns:
+        int: The index of the code in all_codes().
+    """
+    return int(code_numbers()[int("".join(sequence))])
+
+
+def code_sequence(index: int):
+    """
+    Returns:
+        list: The code at the given index as a list of digits characters, as used by check_guess.
+    """
+    return [str(digit) for digit in all_codes()[index]]
+
+
+def check_guess_many(guesses: np.ndarray, secrets: np.ndarray):
+    """
+    Computes the feedback codes of many (guess, secret) pairs in one call.
+
+    Parameters:
+        guesses: uint8 array of codes, shape (..., 4).
+        secrets: uint8 array of codes, shape (..., 4), broadcast against guesses.
+
+    Returns:
+        np.ndarray: uint8 array of the feedback codes, shape (...).
+    """
+    guesses = np.asarray(guesses, dtype=np.uint8)
+    secrets = np.asarray(secrets, dtype=np.uint8)
+    # '⛔' when the digit is in the secret, '✅' when it is also at the right place
+    exact = guesses == secrets
+    present = (guesses[..., :, None] == secrets[..., None, :]).any(axis=-1)
+    values = exact.astype(np.uint8) + present
+    return (values * np.array(PLACE_WEIGHTS, dtype=np.uint8)).sum(
+        axis=-1, dtype=np.uint8
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def feedback_matrix(chunk_size: int = 256):
+    """
+    Computes the feedback of every guess against every secret, built once per process.
+
+    Returns:
+        np.ndarray: 5040 x 5040 uint8 matrix, [guess index, secret index] -> feedback code.
+    """
+    codes = all_codes()
+    matrix = np.empty((len(codes), len(codes)), dtype=np.uint8)
+    for start in range(0, len(codes), chunk_size):
+        matrix[start : start + chunk_size] = check_guess_many(
+            codes[start : start + chunk_size, None], codes[None]
+        )
+    return matrix
+
+
+class CandidateSolver:
+    """
+    Only plays codes that are consistent with every feedback received so far.
+    """
+
+    def __init__(self):
+        self.candidates = np.arange(len(all_codes()))  # Indices of the possible secrets
+
+    def next_guess(self):
+        """
+        Returns:
+            int: The index of the next guess, see code_sequence.
+        """
+        return int(self.candidates[random.randrange(len(self.candidates))])
+
+    def update(self, guess: int, feedback: int):
+        """
+        Removes the candidates that would not have given this feedback.
+
+        Parameters:
+            guess: The index of the guess played.
+            feedback: The feedback code received.
+        """
+        row = feedback_matrix()[guess]
+        self.candidates = self.candidates[row[self.candidates] == feedback]
+
+
+def partition_counts(remaining: np.ndarray, chunk_size: int = 512):
+    """
+    Counts, for every possible guess, how the remaining codes are split by the feedback.
+
+    Parameters:
+        remaining: Indices of the codes still possible.
+        chunk_size: Number of guesses scored at once, to bound the memory used.
+
+    Returns:
+        np.ndarray: (5040, 81) array, [guess index, feedback] -> number of remaining codes.
+    """
+    matrix = feedback_matrix()
+    num_feedbacks = 3**CODE_LENGTH
+    counts = np.empty((len(matrix), num_feedbacks), dtype=np.int64)
+
+    for start in range(0, len(matrix), chunk_size):
+        block = matrix[start : start + chunk_size, remaining].astype(np.int64)
+        # Shift each row in its own range of bins, so a single bincount counts every row
+        block += np.arange(len(block))[:, None] * num_feedbacks
+        counts[start : start + len(block)] = np.bincount(
+            block.ravel(), minlength=len(block) * num_feedbacks
+        ).reshape(len(block), num_feedbacks)
+
+    return counts
+
+
+def score_guesses(strategy: str, remaining: np.ndarray):
+    """
+    Scores every possible guess against the remaining codes, the higher the better.
+
+    Parameters:
+        strategy: 'minimax' (smallest worst case partition, Knuth), 'entropy' (largest expected
+            information) or 'partitions' (largest number of distinct feedbacks).
+        remaining: Indices of the codes still possible.
+
+    Returns:
+        np.ndarray: One score per code.
+    """
+    counts = partition_counts(remaining)
+
+    if strategy == "minimax":
+        return -counts.max(axis=1)
+    if strategy == "entropy":
+        # Up to a constant, the entropy is -sum(c * log2(c)) / n
+        safe_counts = np.maximum(counts, 1)
+        return -(counts * np.log2(safe_counts)).sum(axis=1) / len(remaining)
+    if strategy == "partitions":
+        return (counts > 0).sum(axis=1)
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
+def best_guess(strategy: str, remaining: np.ndarray):
+    """
+    Picks the best scored guess, preferring a code that may be the secret, then the smallest index.
+
+    Returns:
+        int: The index of the guess.
+    """
+    scores = score_guesses(strategy, remaining)
+    best = np.flatnonzero(np.isclose(scores, scores.max()))
+    possible = best[np.isin(best, remaining)]
+    return int(possible[0] if len(possible) else best[0])
+
+
+# With unique digits, every code is the image of any other one by a renaming of the digits,
+# which keeps the feedbacks. All the first guesses are then equivalent for every strategy.
+FIRST_GUESSES = {"minimax": 0, "entropy": 0, "partitions": 0}
+
+# Second guesses already computed, (strategy, first feedback) -> guess index
+second_guesses = {}
+
+
+def choose_guess(strategy: str, remaining: np.ndarray, num_guesses: int):
+    """
+    Deterministic choice of the next guess, only depends on the remaining codes and the turn.
+
+    Parameters:
+        strategy: 'consistent' (first remaining code), 'minimax', 'entropy' or 'partitions'.
+        remaining: Indices of the codes still possible.
+        num_guesses: Number of guesses already played.
+
+    Returns:
+        int: The index of the guess.
+    """
+    if strategy == "consistent":
+        return int(remaining[0])
+    if num_guesses == 0:
+        return FIRST_GUESSES[strategy]
+    if len(remaining) <= 2:
+        return int(remaining[0])
+    return best_guess(strategy, remaining)
+
+
+class OptimizingSolver(CandidateSolver):
+    """
+    Plays the guess that best splits the remaining codes, according to a strategy.
+    """
+
+    def __init__(self, strategy: str = "minimax"):
+        """
+        Parameters:
+            strategy: 'minimax', 'entropy' or 'partitions', see score_guesses.
+        """
+        super().__init__()
+        if strategy not in FIRST_GUESSES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self.strategy = strategy
+        self.feedbacks = []  # Feedback codes received so far
+
+    def next_guess(self):
+        """
+        Returns:
+            int: The index of the next guess, see code_sequence.
+        """
+        if len(self.feedbacks) == 1:
+            # The opening is the same for every game, only compute it once per feedback
+            key = (self.strategy, self.feedbacks[0])
+            if key not in second_guesses:
+                second_guesses[key] = choose_guess(self.strategy, self.candidates, 1)
+            return second_guesses[key]
+
+        return choose_guess(self.strategy, self.candidates, len(self.feedbacks))
+
+    def update(self, guess: int, feedback: int):
+        super().update(guess, feedback)
+        self.feedbacks.append(feedback)
+
+
+def make_solver(strategy: str = "consistent"):
+    """
+    Creates a solver for a strategy name.
+
+    Parameters:
+        strategy: 'consistent' (see CandidateSolver), 'minimax', 'entropy' or 'partitions'
+            (see OptimizingSolver), or 'tree' to replay the precomputed decision tree
+            (see mastermind_tree.default_tree).
+    """
+    if strategy == "consistent":
+        return CandidateSolver()
+    if strategy == "tree":
+        from mastermind_tree import TreeSolver, default_tree
+
+        return TreeSolver(default_tree())
+    return OptimizingSolver(strategy)
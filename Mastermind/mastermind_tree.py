@@ -0,0 +1,304 @@
+import argparse
+import functools
+import os
+import struct
+import time
+import numpy as np
+
+from mastermind_feedback import CODE_LENGTH, WIN_FEEDBACK
+from mastermind_solver import STRATEGIES, all_codes, choose_guess, feedback_matrix
+
+"""
+Exhaustive evaluation of the Mastermind strategies.
+
+A deterministic strategy always plays the same guess for the same remaining codes, so the games
+against the 5040 secrets form a decision tree: each node is a guess and each feedback leads to a
+child node. The tree is built once, each set of remaining codes being solved only once, and then
+gives the exact number of guesses for every secret.
+
+Tree file format (little-endian), every array starting on an 8-byte boundary:
+    - magic: b"MMTREE01"
+    - num_nodes, num_edges: 2 x uint32
+    - guesses: uint16[num_nodes], the code index played at each node, node 0 is the root.
+    - first_edge: uint32[num_nodes + 1], the edges of node i are first_edge[i]:first_edge[i + 1].
+    - feedbacks: uint8[num_edges], the feedback code of each edge, sorted within a node.
+    - children: uint32[num_edges], the node reached by each edge, LEAF for the winning feedback.
+
+The file is memory-mapped when loaded, so a saved tree is replayed without any computation.
+The best tree of the optimizing strategies is shipped as mastermind.tree and played by the
+'tree' solver (see mastermind_solver.make_solver), a pure table walk.
+
+Usage:
+    python mastermind_tree.py minimax --output minimax.tree
+    python mastermind_tree.py --replay minimax.tree
+    python mastermind_tree.py --build-default
+"""
+
+MAGIC = b"MMTREE01"
+DEFAULT_TREE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "mastermind.tree"
+)
+LEAF = 0xFFFFFFFF
+ARRAYS = (
+    ("guesses", np.uint16, 0),
+    ("first_edge", np.uint32, 1),
+    ("feedbacks", np.uint8, None),
+    ("children", np.uint32, None),
+)
+
+
+def aligned(offset: int):
+    """Rounds an offset up to the next multiple of 8."""
+    return -(-offset // 8) * 8
+
+
+class DecisionTree:
+    """
+    Decision tree of a deterministic strategy, stored as flat node and edge arrays.
+    """
+
+    def __init__(self, guesses, first_edge, feedbacks, children):
+        self.guesses = guesses
+        self.first_edge = first_edge
+        self.feedbacks = feedbacks
+        self.children = children
+
+    def child(self, node: int, feedback: int):
+        """
+        Returns:
+            int: The node reached from a node after a feedback.
+
+        Raises:
+            KeyError: If no secret gives this feedback at this node.
+        """
+        start, end = int(self.first_edge[node]), int(self.first_edge[node + 1])
+        edge = start + int(np.searchsorted(self.feedbacks[start:end], feedback))
+        if edge == end or self.feedbacks[edge] != feedback:
+            raise KeyError(f"No code gives the feedback {feedback} at node {node}")
+        return int(self.children[edge])
+
+    def save(self, path: str):
+        """Writes the tree in the binary format described at the top of this module."""
+        header = MAGIC + struct.pack("<II", len(self.guesses), len(self.feedbacks))
+        with open(path, "wb") as f:
+            f.write(header)
+            offset = len(header)
+            for name, dtype, _ in ARRAYS:
+                data = np.ascontiguousarray(getattr(self, name), dtype=dtype).tobytes()
+                f.write(b"\0" * (aligned(offset) - offset))
+                f.write(data)
+                offset = aligned(offset) + len(data)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Memory-maps a tree file, the arrays are read-only views on the file.
+
+        Raises:
+            ValueError: If the file is not a tree file.
+        """
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(buffer[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a Mastermind tree file")
+        num_nodes, num_edges = struct.unpack(
+            "<II", bytes(buffer[len(MAGIC) : len(MAGIC) + 8])
+        )
+
+        arrays = {}
+        offset = len(MAGIC) + 8
+        for name, dtype, extra in ARRAYS:
+            length = num_nodes + extra if extra is not None else num_edges
+            offset = aligned(offset)
+            size = length * np.dtype(dtype).itemsize
+            arrays[name] = buffer[offset : offset + size].view(dtype)
+            offset += size
+        return cls(**arrays)
+
+
+def build_tree(strategy: str):
+    """
+    Builds the decision tree of a strategy against every secret.
+    Each set of remaining codes is solved once, different histories leading to the same codes
+    share the same subtree.
+
+    Parameters:
+        strategy: See mastermind_solver.choose_guess.
+
+    Returns:
+        DecisionTree: The tree, node 0 being the root.
+    """
+    matrix = feedback_matrix()
+    guesses = []
+    node_edges = []
+    solved = {}  # Remaining codes -> node
+
+    def build(remaining, num_guesses):
+        key = remaining.tobytes()
+        if key in solved:
+            return solved[key]
+
+        guess = choose_guess(strategy, remaining, num_guesses)
+        node = len(guesses)
+        solved[key] = node
+        guesses.append(guess)
+        node_edges.append([])
+
+        row = matrix[guess, remaining]
+        for feedback in np.unique(row):
+            if feedback == WIN_FEEDBACK:
+                child = LEAF
+            else:
+                child = build(remaining[row == feedback], num_guesses + 1)
+            node_edges[node].append((int(feedback), child))
+        return node
+
+    build(np.arange(len(all_codes())), 0)
+
+    first_edge = np.cumsum([0] + [len(edges) for edges in node_edges])
+    edges = [edge for edges in node_edges for edge in edges]
+    return DecisionTree(
+        guesses=np.array(guesses, dtype=np.uint16),
+        first_edge=first_edge.astype(np.uint32),
+        feedbacks=np.array([feedback for feedback, _ in edges], dtype=np.uint8),
+        children=np.array([child for _, child in edges], dtype=np.uint32),
+    )
+
+
+def evaluate_tree(tree: DecisionTree):
+    """
+    Plays the tree against every secret at once.
+
+    Returns:
+        np.ndarray: Number of guesses, the winning one included, for each secret index.
+    """
+    matrix = feedback_matrix()
+    num_nodes = len(tree.guesses)
+
+    # Dense (node, feedback) -> child table, to move every game with one lookup
+    child_table = np.full((num_nodes, 3**CODE_LENGTH), LEAF, dtype=np.int64)
+    edge_nodes = np.repeat(np.arange(num_nodes), np.diff(tree.first_edge))
+    child_table[edge_nodes, tree.feedbacks] = tree.children
+
+    secrets = np.arange(len(matrix))
+    nodes = np.zeros(len(secrets), dtype=np.int64)
+    num_guesses = np.zeros(len(secrets), dtype=np.int64)
+    playing = np.ones(len(secrets), dtype=bool)
+
+    while playing.any():
+        guesses = tree.guesses[nodes[playing]].astype(np.int64)
+        num_guesses[playing] += 1
+        found = guesses == secrets[playing]
+        next_nodes = child_table[nodes[playing], matrix[guesses, secrets[playing]]]
+        if (next_nodes[~found] == LEAF).any():
+            raise ValueError("The tree does not solve every secret")
+        nodes[playing] = np.where(found, 0, next_nodes)
+        playing[np.flatnonzero(playing)[found]] = False
+
+    return num_guesses
+
+
+def print_evaluation(num_guesses: np.ndarray):
+    """Prints the exact mean, the worst case and the distribution of the number of guesses."""
+    distribution = np.bincount(num_guesses)
+    print(f"🤖 : Secrets evaluated : {len(num_guesses)}")
+    print(f"🤖 : Mean guesses : {num_guesses.mean():.4f}")
+    print(f"🤖 : Worst case : {num_guesses.max()} guesses")
+    print("🤖 : Distribution :")
+    for guesses, count in enumerate(distribution):
+        if count:
+            print(f"     {guesses} guesses : {count}")
+
+
+def build_default_tree(strategies=("minimax", "entropy", "partitions")):
+    """
+    Builds the trees of the strategies and saves the one with the lowest mean number of guesses,
+    then the lowest worst case, to DEFAULT_TREE_PATH.
+
+    Returns:
+        strategy: The strategy kept.
+        num_guesses: Its number of guesses for each secret, see evaluate_tree.
+    """
+    results = []
+    for strategy in strategies:
+        tree = build_tree(strategy)
+        num_guesses = evaluate_tree(tree)
+        results.append((num_guesses.mean(), num_guesses.max(), strategy, tree))
+
+    _, _, strategy, tree = min(results, key=lambda result: result[:2])
+    tree.save(DEFAULT_TREE_PATH)
+    return strategy, evaluate_tree(tree)
+
+
+@functools.lru_cache(maxsize=None)
+def default_tree():
+    """
+    Memory-maps the shipped tree, built first if the file is missing.
+
+    Returns:
+        DecisionTree: The tree of the default 4-digit game.
+    """
+    if not os.path.exists(DEFAULT_TREE_PATH):
+        build_default_tree()
+    return DecisionTree.load(DEFAULT_TREE_PATH)
+
+
+class TreeSolver:
+    """
+    Replays a decision tree, with the same interface as the solvers of mastermind_solver.
+    """
+
+    def __init__(self, tree: DecisionTree):
+        self.tree = tree
+        self.node = 0
+
+    def next_guess(self):
+        """
+        Returns:
+            int: The index of the next guess, see mastermind_solver.code_sequence.
+        """
+        return int(self.tree.guesses[self.node])
+
+    def update(self, guess: int, feedback: int):
+        """Follows the edge of the feedback received."""
+        self.node = self.tree.child(self.node, feedback)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Evaluates a strategy against every Mastermind secret."
+    )
+    parser.add_argument("strategy", nargs="?", choices=STRATEGIES, default="minimax")
+    parser.add_argument("--output", help="Path where the decision tree is saved.")
+    parser.add_argument(
+        "--replay", help="Evaluates a saved tree instead of a strategy."
+    )
+    parser.add_argument(
+        "--build-default",
+        action="store_true",
+        help=f"Saves the best tree of the strategies to {DEFAULT_TREE_PATH}.",
+    )
+    args = parser.parse_args()
+
+    start_time = time.time()
+    if args.build_default:
+        strategy, num_guesses = build_default_tree()
+        print(
+            f"🤖 : Tree of the '{strategy}' strategy saved to {DEFAULT_TREE_PATH} "
+            f"in {time.time() - start_time:.2f} seconds."
+        )
+        print_evaluation(num_guesses)
+    elif args.replay:
+        tree = DecisionTree.load(args.replay)
+        print(f"🤖 : Tree loaded from {args.replay}.")
+    else:
+        tree = build_tree(args.strategy)
+        print(
+            f"🤖 : Tree of the '{args.strategy}' strategy built in {time.time() - start_time:.2f} seconds "
+            f"({len(tree.guesses)} nodes)."
+        )
+        if args.output:
+            tree.save(args.output)
+            print(f"🤖 : Tree saved to {args.output}.")
+
+    if not args.build_default:
+        print_evaluation(evaluate_tree(tree))
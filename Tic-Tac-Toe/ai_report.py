@@ -0,0 +1,190 @@
+import argparse
+import contextlib
+import os
+import random
+import numpy as np
+
+from move_cache import MoveCache
+from n_tic_tac_toe import ComputerPlayer, Game, Player
+
+"""
+Headless report on the ComputerPlayer heuristics.
+
+Plays many games without printing anything, records every decision made by the computer
+(see ComputerPlayer.move) and prints, for each step of the strategy, how often it produced
+the move and how long it took, as percentile tables.
+
+Usage:
+    python ai_report.py --games 1000 --size 3 --n 3 --opponent random
+"""
+
+STEPS = ("cache", "win", "block", "block_fork", "fork", "strategic", "random")
+PERCENTILES = (50, 90, 99)
+
+
+class RandomPlayer(Player):
+    """
+    Plays a random available move, used as a sparring partner for the computer.
+    """
+
+    def __init__(self, mark: str, name: str = None):
+        self.name = f"Random_{mark}" if not (name) else name
+        self.mark = mark
+
+    def move(self, board: object, game: object):
+        row, col = random.choice(board.available_moves)
+        board.update_board(row, col, self.mark)
+
+
+def run_headless_games(
+    num_games, size=3, n=3, opponent="random", seed=None, move_cache=None
+):
+    """
+    Plays games between an instrumented computer player and an opponent, without any output.
+    The computer alternates between 'X' and 'O' so it plays first in half of the games.
+
+    Parameters:
+        num_games: Number of games to play.
+        size: Board size.
+        n: Number of marks to align to win.
+        opponent: 'random' for a RandomPlayer, 'cpu' for another ComputerPlayer.
+        seed: Seed for the random module, for repeatable runs.
+        move_cache: Optional MoveCache given to the computer players.
+
+    Returns:
+        records: List of decision records (see ComputerPlayer.move).
+        results: Dictionary counting the 'win', 'loss' and 'tie' of the computer.
+    """
+    random.seed(seed)
+    records = []
+    results = {"win": 0, "loss": 0, "tie": 0}
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for game_num in range(num_games):
+            computer_mark, opponent_mark = (
+                ("X", "O") if game_num % 2 == 0 else ("O", "X")
+            )
+
+            computer = ComputerPlayer(computer_mark, name="Computer", cache=move_cache)
+            computer.stats = records
+            if opponent == "cpu":
+                rival = ComputerPlayer(opponent_mark, name="Rival", cache=move_cache)
+                rival.stats = records
+            else:
+                rival = RandomPlayer(opponent_mark)
+
+            players = {computer_mark: computer, opponent_mark: rival}
+            winner = Game(size=size, n=n).play_round(players["X"], players["O"])
+
+            if winner is None:
+                results["tie"] += 1
+            elif winner is computer:
+                results["win"] += 1
+            else:
+                results["loss"] += 1
+
+    return records, results
+
+
+def percentile_row(values, scale=1.0):
+    """
+    Formats the percentiles and the maximum of a list of values.
+
+    Parameters:
+        values: The values to summarize.
+        scale: Factor applied to the values before formatting (e.g. 1e6 for microseconds).
+
+    Returns:
+        str: The formatted columns.
+    """
+    if len(values) == 0:
+        return "".join(f"{'-':>10}" for _ in range(len(PERCENTILES) + 1))
+    values = np.asarray(values, dtype=float) * scale
+    columns = list(np.percentile(values, PERCENTILES)) + [values.max()]
+    return "".join(f"{column:>10.1f}" for column in columns)
+
+
+def print_report(records, results):
+    """
+    Prints the step statistics as percentile tables.
+
+    Parameters:
+        records: List of decision records (see ComputerPlayer.move).
+        results: Dictionary counting the 'win', 'loss' and 'tie' of the computer.
+    """
+    num_games = sum(results.values())
+    num_decisions = len(records)
+    header_percentiles = "".join(f"{f'p{p}':>10}" for p in PERCENTILES) + f"{'max':>10}"
+
+    print(f"\n🤖 : {num_decisions} decisions over {num_games} games.")
+    print(
+        "🤖 : Computer results : "
+        + " | ".join(
+            f"{result} {100 * count / max(num_games, 1):.1f}%"
+            for result, count in results.items()
+        )
+    )
+
+    # Which step produced the move, and the time spent in each step whenever it ran
+    total_time = sum(sum(record["times"].values()) for record in records)
+    # Steps that never ran (e.g. 'cache' without a move cache) are left out of the report
+    steps_run = [
+        step for step in STEPS if any(step in record["times"] for record in records)
+    ]
+    print("\nTime spent in each step (µs), over the decisions where it ran :")
+    print(f"{'step':<12}{'fired':>8}{'share':>8}{'cost':>8}" + header_percentiles)
+    for step in steps_run:
+        fired = sum(1 for record in records if record["step"] == step)
+        times = [record["times"][step] for record in records if step in record["times"]]
+        cost = sum(times) / total_time if total_time else 0.0
+        print(
+            f"{step:<12}{fired:>8}{100 * fired / max(num_decisions, 1):>7.1f}%{100 * cost:>7.1f}%"
+            + percentile_row(times, scale=1e6)
+        )
+    decision_times = [sum(record["times"].values()) for record in records]
+    print(
+        f"{'decision':<12}{num_decisions:>8}{'':>16}"
+        + percentile_row(decision_times, scale=1e6)
+    )
+
+    # Work done per decision, grouped by the step that produced the move
+    for counter in ("cells", "lines"):
+        print(f"\n{counter.capitalize()} examined per decision, by producing step :")
+        print(f"{'step':<12}" + header_percentiles)
+        for step in steps_run + ["all"]:
+            values = [
+                record[counter]
+                for record in records
+                if step == "all" or record["step"] == step
+            ]
+            print(f"{step:<12}" + percentile_row(values))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Report on the ComputerPlayer heuristics."
+    )
+    parser.add_argument("--games", type=int, default=1000, help="Number of games.")
+    parser.add_argument("--size", type=int, default=3, help="Board size.")
+    parser.add_argument("--n", type=int, default=3, help="Marks to align to win.")
+    parser.add_argument("--opponent", choices=("random", "cpu"), default="random")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="Directory of a move cache to use (see move_cache.py).",
+    )
+    args = parser.parse_args()
+
+    move_cache = MoveCache(args.cache) if args.cache else None
+    records, results = run_headless_games(
+        args.games,
+        size=args.size,
+        n=args.n,
+        opponent=args.opponent,
+        seed=args.seed,
+        move_cache=move_cache,
+    )
+    if move_cache is not None:
+        move_cache.close()
+    print_report(records, results)
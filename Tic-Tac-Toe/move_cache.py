@@ -0,0 +1,295 @@
+import functools
+import mmap
+import os
+import threading
+import numpy as np
+
+"""
+Persistent cache of the ComputerPlayer decisions.
+
+Positions are stored in a canonical form: the marks are written from the point of view of the
+player to move (own / opponent) and the board is reduced over its 8 symmetries (rotations and
+reflections), so the same opening played with the other mark or mirrored hits the same entry.
+
+Each (size, n) pair has its own files in the cache directory:
+    - '<size>_<n>.bin': Sorted table of fixed-size records, memory-mapped and binary searched.
+    - '<size>_<n>.log': New decisions appended as they are made, replayed at start-up.
+
+Once the log holds enough records, a background thread merges it into the sorted table.
+A record is the packed position (2 bits per cell) followed by the move as a 2-byte cell index.
+"""
+
+MOVE_BYTES = 2
+DEFAULT_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "move_cache"
+)
+
+
+def position_codes(board: object, mark: str):
+    """
+    Encodes the board from the point of view of the player to move.
+
+    Parameters:
+        board: From Board class, the board on which we play.
+        mark: The mark of the player to move.
+
+    Returns:
+        np.ndarray: size x size array with 0 for empty, 1 for own and 2 for opponent marks.
+    """
+    codes = np.zeros((board.size, board.size), dtype=np.uint8)
+    codes[board.board == mark] = 1
+    codes[(board.board != mark) & (board.board != " ")] = 2
+    return codes
+
+
+@functools.lru_cache(maxsize=None)
+def symmetry_cells(size: int):
+    """
+    Lists the 8 images of the board by the rotations and reflections of the square.
+
+    Returns:
+        np.ndarray: 8 x (size * size) array, row k maps each flat cell of the k-th image
+        to the flat cell of the original board.
+    """
+    indices = np.arange(size * size).reshape(size, size)
+    images = []
+    for k in range(4):
+        rotated = np.rot90(indices, k)
+        images.append(rotated.ravel())
+        images.append(np.fliplr(rotated).ravel())
+    return np.array(images)
+
+
+def pack_codes(codes: np.ndarray):
+    """
+    Packs cell codes (0, 1 or 2) on 2 bits each, one packed row per row of codes.
+
+    Returns:
+        np.ndarray: uint8 array of ceil(cells / 4) bytes per row.
+    """
+    rows, cells = codes.shape
+    padded = np.zeros((rows, -(-cells // 4) * 4), dtype=np.uint8)
+    padded[:, :cells] = codes
+    return (padded.reshape(rows, -1, 4) @ np.array([64, 16, 4, 1])).astype(np.uint8)
+
+
+def canonical_position(board: object, mark: str):
+    """
+    Finds the canonical form of the position.
+
+    Parameters:
+        board: From Board class, the board on which we play.
+        mark: The mark of the player to move.
+
+    Returns:
+        key: The packed canonical position.
+        cells: Array mapping a flat cell index of the canonical board to the original board.
+    """
+    cells = symmetry_cells(board.size)
+    keys = [
+        key.tobytes() for key in pack_codes(position_codes(board, mark).ravel()[cells])
+    ]
+    best = min(range(len(keys)), key=keys.__getitem__)
+    return keys[best], cells[best]
+
+
+class MoveTable:
+    """
+    Decisions for one (size, n) pair: a sorted memory-mapped table plus the pending decisions.
+    """
+
+    def __init__(self, directory: str, size: int, n: int):
+        self.size = size
+        self.key_bytes = -(-size * size // 4)
+        self.record_bytes = self.key_bytes + MOVE_BYTES
+        self.table_path = os.path.join(directory, f"{size}_{n}.bin")
+        self.log_path = os.path.join(directory, f"{size}_{n}.log")
+        self.lock = threading.Lock()
+        self.table = None
+        self.table_file = None
+        self.pending = {}  # Decisions not merged in the table yet
+
+        self.open_table()
+
+        # Replay the decisions saved since the last compaction
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "rb") as f:
+                data = f.read()
+            # Ignore a torn last record
+            usable = len(data) - len(data) % self.record_bytes
+            for start in range(0, usable, self.record_bytes):
+                record = data[start : start + self.record_bytes]
+                self.pending[record[: self.key_bytes]] = record[self.key_bytes :]
+        self.log = open(self.log_path, "ab")
+
+    def open_table(self):
+        """Memory-maps the sorted table, if any."""
+        if os.path.exists(self.table_path) and os.path.getsize(self.table_path) > 0:
+            self.table_file = open(self.table_path, "rb")
+            self.table = mmap.mmap(self.table_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close_table(self):
+        """Unmaps the sorted table."""
+        if self.table is not None:
+            self.table.close()
+            self.table_file.close()
+            self.table = None
+            self.table_file = None
+
+    def search_table(self, key: bytes):
+        """
+        Binary search of a key in the sorted table.
+
+        Returns:
+            bytes: The stored move or None.
+        """
+        if self.table is None:
+            return None
+        low, high = 0, len(self.table) // self.record_bytes
+        while low < high:
+            middle = (low + high) // 2
+            start = middle * self.record_bytes
+            middle_key = self.table[start : start + self.key_bytes]
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                return self.table[start + self.key_bytes : start + self.record_bytes]
+        return None
+
+    def get(self, key: bytes):
+        """
+        Returns:
+            int: The canonical cell index stored for the key or None.
+        """
+        with self.lock:
+            move = self.pending.get(key)
+            if move is None:
+                move = self.search_table(key)
+        return None if move is None else int.from_bytes(move, "little")
+
+    def put(self, key: bytes, cell: int):
+        """Saves a decision in the log, it is merged in the table by the next compaction."""
+        move = cell.to_bytes(MOVE_BYTES, "little")
+        with self.lock:
+            self.pending[key] = move
+            self.log.write(key + move)
+            self.log.flush()
+
+    def compact(self):
+        """Merges the pending decisions into a new sorted table and truncates the log."""
+        with self.lock:
+            merged = dict(self.pending)
+            if not merged:
+                return
+            if self.table is not None:
+                table = bytes(self.table)
+            else:
+                table = b""
+
+        # Build the new table outside the lock, lookups keep working meanwhile
+        records = {
+            table[start : start + self.key_bytes]: table[
+                start + self.key_bytes : start + self.record_bytes
+            ]
+            for start in range(0, len(table), self.record_bytes)
+        }
+        records.update(merged)
+        temporary_path = self.table_path + ".tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(b"".join(key + records[key] for key in sorted(records)))
+
+        with self.lock:
+            self.close_table()
+            os.replace(temporary_path, self.table_path)
+            self.open_table()
+
+            # Keep in the log only the decisions made during the compaction
+            for key, move in merged.items():
+                if self.pending.get(key) == move:
+                    del self.pending[key]
+            self.log.close()
+            with open(self.log_path, "wb") as f:
+                f.write(b"".join(key + move for key, move in self.pending.items()))
+            self.log = open(self.log_path, "ab")
+
+    def close(self):
+        with self.lock:
+            self.log.close()
+            self.close_table()
+
+
+class MoveCache:
+    """
+    On-disk store of (size, n, canonical position) -> chosen move, shared by the computer players.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, compact_every: int = 64):
+        """
+        Parameters:
+            directory: Directory holding the cache files, created if needed.
+            compact_every: Number of pending decisions that triggers a background compaction.
+        """
+        self.directory = directory
+        self.compact_every = compact_every
+        self.tables = {}
+        self.compaction = None
+        os.makedirs(directory, exist_ok=True)
+
+    def get_table(self, board: object, game: object):
+        key = (board.size, game.n)
+        if key not in self.tables:
+            self.tables[key] = MoveTable(self.directory, board.size, game.n)
+        return self.tables[key]
+
+    def lookup(self, board: object, game: object, mark: str):
+        """
+        Looks for a decision already made on this position.
+
+        Parameters:
+            board: From Board class, the board on which we play.
+            game: Current game instance.
+            mark: The mark of the player to move.
+
+        Returns:
+            tuple: The (row, col) of the stored move or None.
+        """
+        key, cells = canonical_position(board, mark)
+        cell = self.get_table(board, game).get(key)
+        if cell is None:
+            return None
+        return divmod(int(cells[cell]), board.size)
+
+    def store(self, board: object, game: object, mark: str, move: tuple):
+        """
+        Saves a decision, the board must be the one before the move is played.
+
+        Parameters:
+            board: From Board class, the board on which we play.
+            game: Current game instance.
+            mark: The mark of the player to move.
+            move: The (row, col) chosen.
+        """
+        key, cells = canonical_position(board, mark)
+        row, col = move
+        cell = int(np.flatnonzero(cells == row * board.size + col)[0])
+        table = self.get_table(board, game)
+        table.put(key, cell)
+
+        if len(table.pending) >= self.compact_every:
+            self.compact_in_background(table)
+
+    def compact_in_background(self, table: MoveTable):
+        """Starts a compaction thread, unless one is already running."""
+        if self.compaction is not None and self.compaction.is_alive():
+            return
+        self.compaction = threading.Thread(target=table.compact, daemon=True)
+        self.compaction.start()
+
+    def close(self):
+        """Waits for the running compaction and closes the files."""
+        if self.compaction is not None:
+            self.compaction.join()
+        for table in self.tables.values():
+            table.close()
@@ -1,6 +1,9 @@
 import random
+import time
 import numpy as np
 
+from move_cache import MoveCache
+
 
 class Player:
     """
@@ -52,15 +55,39 @@ class ComputerPlayer(Player):
     Defines the characteristics and abilities for a computer player.
     """
 
-    def __init__(self, mark: str):
-        self.name = input(f"🤖 : Please, enter a name for computer {mark} player : ")
-        self.name = f"Computer_{mark}" if not (self.name) else self.name
+    def __init__(self, mark: str, name: str = None, cache: MoveCache = None):
+        """
+        Parameters:
+            mark: The player's mark ('X' or 'O').
+            name: The player's name, asked to the user if not given.
+            cache: Optional MoveCache, positions already seen are answered from it.
+        """
+        if name is None:
+            name = input(f"🤖 : Please, enter a name for computer {mark} player : ")
+        self.name = f"Computer_{mark}" if not (name) else name
         self.mark = mark
+        self.cache = cache
+
+        # Instrumentation, set stats to a list to record every decision
+        self.stats = None
+        self.cells_examined = 0
+        self.lines_examined = 0
 
     def move(self, board: object, game: object):
         """
         Makes the computer player move intelligently by evaluating the board.
 
+        When self.cache is set, a position already seen is answered from it without running the
+        steps, and new decisions are saved in it, except the random ones: a random pick is not a
+        decision of the position, it must not replace the other moves it could have been.
+
+        When self.stats is a list, a record is appended for each decision with:
+            step: The step that produced the move ('cache', 'win', 'block', 'block_fork', 'fork',
+                'strategic' or 'random').
+            times: Seconds spent in each step that ran, 'cache' only when a cache is set.
+            cells, lines: Number of board cells and winning lines examined.
+            size, n: The board size and the number of marks to align.
+
         Parameters:
             board: From Board class, the board on which we play.
             game: Current game instance.
@@ -68,50 +95,80 @@ class ComputerPlayer(Player):
         print(f"🤖 : It's {self.name} turn.\n")
         print(f"🤖 : Let's place '{self.mark}' !\n")
 
-        # Step 1: Try to win
-        winning_move = self.find_winning_move(board, game)
-        if winning_move:
-            print(f"🤖 : {self.name} decided to attack !")
-            row, col = winning_move
-            print(f"🤖 : {self.name} placed {self.mark} at {(row, col)}.")
-            board.update_board(row, col, self.mark)
-            return
-
-        # Step 2: Block opponent from winning
-        blocking_move = self.find_blocking_move(board, game)
-        if blocking_move:
-            print(f"🤖 : {self.name} blocked you from winning easily !")
-            row, col = blocking_move
-            print(f"🤖 : {self.name} placed {self.mark} at {(row, col)}.")
-            board.update_board(row, col, self.mark)
-            return
-
-        # Step 3: Block opponent's fork
-        blocking_fork_move = self.find_blocking_fork_move(board, game)
-        if blocking_fork_move:
-            print(f"🤖 : {self.name} blocked a great move you could've done !")
-            row, col = blocking_fork_move
-            print(f"🤖 : {self.name} placed {self.mark} at {(row, col)}.")
-            board.update_board(row, col, self.mark)
-            return
-
-        # Step 4: Try to create a fork
-        fork_move = self.find_fork_move(board, game)
-        if fork_move:
-            print(f"🤖 : {self.name} trying a tricky move !")
-            row, col = fork_move
-            print(f"🤖 : {self.name} placed {self.mark} at {(row, col)}.")
-            board.update_board(row, col, self.mark)
-            return
-
-        # Step 5: Play strategically (e.g., pick center, then corners)
-        strategic_move = self.find_best_move(board)
-        if strategic_move:
-            print(f"🤖 : {self.name} did a classic, but great move !")
-            row, col = strategic_move
-            print(f"🤖 : {self.name} placed {self.mark} at {(row, col)}.")
-            board.update_board(row, col, self.mark)
-            return
+        steps = [
+            # Step 1: Try to win
+            ("win", lambda: self.find_winning_move(board, game), "decided to attack !"),
+            # Step 2: Block opponent from winning
+            (
+                "block",
+                lambda: self.find_blocking_move(board, game),
+                "blocked you from winning easily !",
+            ),
+            # Step 3: Block opponent's fork
+            (
+                "block_fork",
+                lambda: self.find_blocking_fork_move(board, game),
+                "blocked a great move you could've done !",
+            ),
+            # Step 4: Try to create a fork
+            (
+                "fork",
+                lambda: self.find_fork_move(board, game),
+                "trying a tricky move !",
+            ),
+            # Step 5: Play strategically (e.g., pick center, then corners)
+            (
+                "strategic",
+                lambda: self.find_best_move(board),
+                "did a classic, but great move !",
+            ),
+            # Step 6: Otherwise, play any available move
+            (
+                "random",
+                lambda: random.choice(board.available_moves),
+                "picked a move at random !",
+            ),
+        ]
+        if self.cache is not None:
+            # Step 0: Remember a previous decision on this position
+            steps.insert(
+                0,
+                (
+                    "cache",
+                    lambda: self.cache.lookup(board, game, self.mark),
+                    "remembers this position !",
+                ),
+            )
+
+        self.cells_examined = 0
+        self.lines_examined = 0
+        times = {}
+
+        for step, find_move, comment in steps:
+            start = time.perf_counter()
+            chosen_move = find_move()
+            times[step] = time.perf_counter() - start
+
+            if chosen_move:
+                print(f"🤖 : {self.name} {comment}")
+                row, col = chosen_move
+                if self.cache is not None and step not in ("cache", "random"):
+                    self.cache.store(board, game, self.mark, chosen_move)
+                print(f"🤖 : {self.name} placed {self.mark} at {(row, col)}.")
+                board.update_board(row, col, self.mark)
+                break
+
+        if self.stats is not None:
+            self.stats.append(
+                {
+                    "step": step,
+                    "times": times,
+                    "cells": self.cells_examined,
+                    "lines": self.lines_examined,
+                    "size": board.size,
+                    "n": game.n,
+                }
+            )
 
     def find_winning_move(self, board: object, game: object):
         """
@@ -154,6 +211,8 @@ class ComputerPlayer(Player):
         """
         for condition in game.generate_winning_conditions():
             line = [board.board[pos] for pos in condition]
+            self.lines_examined += 1
+            self.cells_examined += len(condition)
             if line.count(player_mark) == (game.n - 1) and line.count(" ") == 1:
                 empty_spot = condition[line.index(" ")]
                 return empty_spot
@@ -237,6 +296,8 @@ class ComputerPlayer(Player):
         winning_paths = 0
         for condition in game.generate_winning_conditions():
             line = [board.board[pos] for pos in condition]
+            self.lines_examined += 1
+            self.cells_examined += len(condition)
             if line.count(player_mark) == (game.n - 1) and line.count(" ") == 1:
                 winning_paths += 1
         return winning_paths
@@ -253,6 +314,7 @@ class ComputerPlayer(Player):
         """
         # Strategy: prioritize center, then corners, then edges
         center = (board.size // 2, board.size // 2)
+        self.cells_examined += 1
         if center in board.available_moves:
             return center
 
@@ -263,11 +325,11 @@ class ComputerPlayer(Player):
             (board.size - 1, board.size - 1),
         ]
         for corner in corners:
+            self.cells_examined += 1
             if corner in board.available_moves:
                 return corner
 
-        # Otherwise, return a random available move
-        return random.choice(board.available_moves)
+        return None
 
 
 class Board:
@@ -275,7 +337,26 @@ class Board:
     Defines the board characteristics.
     """
 
-    def __init__(self):
+    def __init__(self, size: int = None):
+        """
+        Parameters:
+            size: The board size, asked to the user if not given.
+        """
+        if size is None:
+            self.ask_size()
+        else:
+            self.size = size
+        self.board = np.array(
+            [[" " for _ in range(self.size)] for _ in range(self.size)]
+        )
+        self.available_moves = list(
+            (i, j) for i in range(self.size) for j in range(self.size)
+        )
+
+    def ask_size(self):
+        """
+        Asks the size of the board until a valid one is given.
+        """
         while True:
             try:
                 self.size = int(input("🤖 : Please, enter the size of the board : "))
@@ -287,12 +368,6 @@ class Board:
                     )
             except ValueError:
                 print("❌❌ Invalid input! ❌❌\n🤖 : Please enter an integer value.\n")
-        self.board = np.array(
-            [[" " for _ in range(self.size)] for _ in range(self.size)]
-        )
-        self.available_moves = list(
-            (i, j) for i in range(self.size) for j in range(self.size)
-        )
 
     def print_board_with_borders(self):
         """
@@ -371,9 +446,27 @@ class Game:
     Defines the game flow.
     """
 
-    def __init__(self):
-        self.game_opening()
-        self.board = Board()
+    def __init__(self, size: int = None, n: int = None, move_cache: MoveCache = None):
+        """
+        Parameters:
+            size: The board size, asked to the user if not given.
+            n: The number of marks to align to win, asked to the user if not given.
+            move_cache: Optional MoveCache given to the computer players.
+        """
+        self.move_cache = move_cache
+        if size is None:
+            self.game_opening()
+        self.board = Board(size)
+        if n is None:
+            self.ask_n()
+        else:
+            self.n = n
+        self.winning_conditions = self.generate_winning_conditions()
+
+    def ask_n(self):
+        """
+        Asks the number of marks to align until a valid one is given.
+        """
         while True:
             try:
                 self.n = int(
@@ -389,7 +482,6 @@ class Game:
                     )
             except ValueError:
                 print("❌❌ Invalid input! ❌❌\n🤖 : Please enter an integer value.\n")
-        self.winning_conditions = self.generate_winning_conditions()
 
     def game_opening(self):
         print(
@@ -510,7 +602,7 @@ class Game:
             response = input("🤖 : Do you want to play again? (y/n): ").lower().strip()
             if response == "y":
                 print("🤖 : Starting a new game!\n")
-                self.__init__()
+                self.__init__(move_cache=self.move_cache)
                 self.play()
                 break
             elif response == "n":
@@ -526,13 +618,35 @@ class Game:
         info_X = input(
             "🤖 : Please enter 'cpu' if you want a computer to place 'X' : "
         ).lower()
-        player_X = ComputerPlayer("X") if info_X == "cpu" else Player("X")
+        player_X = (
+            ComputerPlayer("X", cache=self.move_cache)
+            if info_X == "cpu"
+            else Player("X")
+        )
 
         info_O = input(
             "🤖 : Please enter 'cpu' if you want a computer to place 'O' : "
         ).lower()
-        player_O = ComputerPlayer("O") if info_O == "cpu" else Player("O")
+        player_O = (
+            ComputerPlayer("O", cache=self.move_cache)
+            if info_O == "cpu"
+            else Player("O")
+        )
+
+        self.play_round(player_X, player_O)
+        self.restart_game()
+
+    def play_round(self, player_X: object, player_O: object):
+        """
+        Plays one game until a win or a tie.
 
+        Parameters:
+            player_X: The player placing 'X', plays first.
+            player_O: The player placing 'O'.
+
+        Returns:
+            The winning player, or None for a tie.
+        """
         current_player = player_X
 
         while True:
@@ -544,19 +658,19 @@ class Game:
             if self.check_winning(current_player.name):
                 self.board.print_board_with_borders()
                 print(f"🤖 : Congratulations {current_player.name}, you win! ✨")
-                break
+                return current_player
 
             if self.is_tie():
                 self.board.print_board_with_borders()
                 print("🤖 : It's a tie !")
-                break
+                return None
 
             # Switch players
             current_player = player_O if current_player == player_X else player_X
 
-        self.restart_game()
-
 
 if __name__ == "__main__":
-    game = Game()
+    move_cache = MoveCache()
+    game = Game(move_cache=move_cache)
     game.play()
+    move_cache.close()
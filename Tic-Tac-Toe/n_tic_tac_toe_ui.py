@@ -1,6 +1,8 @@
 import sys
 import pygame
 import random
+import threading
+import functools
 import numpy as np
 
 # Initialize pygame
@@ -26,6 +28,40 @@ TEXT_COLOR = (0, 0, 0)
 
 # Fonts
 FONT = pygame.font.Font(None, 50)
+SMALL_FONT = pygame.font.Font(None, 32)
+
+# Computer player
+AI_MOVE_EVENT = pygame.USEREVENT + 1  # Posted by the worker thread with the chosen move
+AI_THINKING_DELAY = 0.5  # Seconds, delay for realism
+
+# Bitmasks used by the computer player, cell (row, col) is the bit row * 3 + col
+WIN_MASKS = (
+    0b000000111,  # Rows
+    0b000111000,
+    0b111000000,
+    0b001001001,  # Columns
+    0b010010010,
+    0b100100100,
+    0b100010001,  # Descending diagonal
+    0b001010100,  # Ascending diagonal
+)
+IS_WIN = tuple(any(mask & win == win for win in WIN_MASKS) for mask in range(512))
+STRATEGIC_CELLS = (4, 0, 2, 6, 8, 1, 3, 5, 7)  # Center, then corners, then sides
+
+# Rendering
+FPS = 30  # Frame rate while the thinking indicator is animated
+THINKING_RECT = pygame.Rect(5, 5, 140, 30)
+# Events after which the window content must be painted again
+REDRAW_EVENTS = (
+    pygame.VIDEOEXPOSE,
+    pygame.VIDEORESIZE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWSHOWN,
+    pygame.WINDOWSIZECHANGED,
+)
+HUMAN_BUTTON = pygame.Rect(WIDTH // 4 - 100, HEIGHT // 2 - 50, 200, 100)
+COMPUTER_BUTTON = pygame.Rect(3 * WIDTH // 4 - 100, HEIGHT // 2 - 50, 200, 100)
 
 # Initialize the screen
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -40,7 +76,19 @@ game_mode = None  # 'human' or 'computer'
 player = 1  # Current player (1 for circle, 2 for cross)
 
 
+# Rendered text surfaces, keyed by (text, font, color)
+text_cache = {}
+
+
 # Functions
+def render_text(text, font=FONT, color=TEXT_COLOR):
+    """Renders a text once and reuses the surface on the following frames."""
+    key = (text, font, color)
+    if key not in text_cache:
+        text_cache[key] = font.render(text, True, color)
+    return text_cache[key]
+
+
 def draw_lines():
     """Draws the grid lines on the board."""
     # Horizontal lines
@@ -99,17 +147,17 @@ def draw_figures():
 
 def draw_buttons():
     """Draws buttons for selecting the game mode."""
-    human_button = pygame.Rect(WIDTH // 4 - 100, HEIGHT // 2 - 50, 200, 100)
-    computer_button = pygame.Rect(3 * WIDTH // 4 - 100, HEIGHT // 2 - 50, 200, 100)
+    human_button = HUMAN_BUTTON
+    computer_button = COMPUTER_BUTTON
 
     # Draw human button
     pygame.draw.rect(screen, BUTTON_COLOR, human_button)
-    human_text = FONT.render("Human", True, TEXT_COLOR)
+    human_text = render_text("Human")
     screen.blit(human_text, (human_button.x + 40, human_button.y + 25))
 
     # Draw computer button
     pygame.draw.rect(screen, BUTTON_COLOR, computer_button)
-    computer_text = FONT.render("Computer", True, TEXT_COLOR)
+    computer_text = render_text("Computer")
     screen.blit(computer_text, (computer_button.x + 10, computer_button.y + 25))
 
     return human_button, computer_button
@@ -130,8 +178,13 @@ def is_board_full():
     return not np.any(board == 0)
 
 
-def check_win(player, draw_winning_line=True):
-    """Checks if the given player has won the game."""
+def winning_line(board, player):
+    """
+    Finds the line completed by the given player.
+
+    Returns:
+        tuple: ("vertical", col), ("horizontal", row), ("ascending",) or ("descending",), None if no win.
+    """
     # Vertical win
     for col in range(BOARD_COLS):
         if (
@@ -139,9 +192,7 @@ def check_win(player, draw_winning_line=True):
             and board[1][col] == player
             and board[2][col] == player
         ):
-            if draw_winning_line:
-                draw_vertical_winning_line(col, player)
-            return True
+            return ("vertical", col)
 
     # Horizontal win
     for row in range(BOARD_ROWS):
@@ -150,23 +201,35 @@ def check_win(player, draw_winning_line=True):
             and board[row][1] == player
             and board[row][2] == player
         ):
-            if draw_winning_line:
-                draw_horizontal_winning_line(row, player)
-            return True
+            return ("horizontal", row)
 
     # Ascending diagonal win
     if board[2][0] == player and board[1][1] == player and board[0][2] == player:
-        if draw_winning_line:
-            draw_ascending_diagonal(player)
-        return True
+        return ("ascending",)
 
     # Descending diagonal win
     if board[0][0] == player and board[1][1] == player and board[2][2] == player:
-        if draw_winning_line:
-            draw_descending_diagonal(player)
-        return True
+        return ("descending",)
 
-    return False
+    return None
+
+
+def check_win(player, draw_winning_line=True):
+    """Checks if the given player has won the game."""
+    line = winning_line(board, player)
+    if line is None:
+        return False
+
+    if draw_winning_line:
+        if line[0] == "vertical":
+            draw_vertical_winning_line(line[1], player)
+        elif line[0] == "horizontal":
+            draw_horizontal_winning_line(line[1], player)
+        elif line[0] == "ascending":
+            draw_ascending_diagonal(player)
+        else:
+            draw_descending_diagonal(player)
+    return True
 
 
 def draw_vertical_winning_line(col, player):
@@ -206,247 +269,328 @@ def restart():
     player = 1
 
 
-def computer_move(player):
+def board_masks(board, player):
+    """
+    Converts the board to bitmasks.
+
+    Returns:
+        tuple: (own, opponent) masks, the bit row * 3 + col is set when the cell is taken.
+    """
+    own = opponent = 0
+    for row in range(BOARD_ROWS):
+        for col in range(BOARD_COLS):
+            if board[row][col] == player:
+                own |= 1 << (row * BOARD_COLS + col)
+            elif board[row][col] == 3 - player:
+                opponent |= 1 << (row * BOARD_COLS + col)
+    return own, opponent
+
+
+def computer_move(board, player, cancel_event=None):
     """
     Makes the computer player move intelligently by evaluating the board.
 
     Parameters:
-        board: From Board class, the board on which we play.
+        board: The board on which we play, it may be a copy of the displayed one.
+        player: The computer player (1 or 2).
+        cancel_event: Optional threading.Event, no move is returned once it is set.
+
+    Returns:
+        tuple: The (row, col) of the chosen move, None if cancelled.
+    """
+    own, opponent = board_masks(board, player)
+    cell = decide_move(own, opponent)
+    if cell is None or (cancel_event is not None and cancel_event.is_set()):
+        return None
+    return divmod(cell, BOARD_COLS)
+
+
+@functools.lru_cache(maxsize=None)
+def decide_move(own, opponent):
+    """
+    Runs the computer strategy on a position, each position is only evaluated once.
+
+    Parameters:
+        own: Bitmask of the computer marks.
+        opponent: Bitmask of the opponent marks.
+
+    Returns:
+        int: The chosen cell (row * 3 + col) or None if the board is full.
     """
     # Step 1: Try to win
-    winning_move = find_winning_move(board, player)
-    if winning_move:
-        row, col = winning_move
-        return (row, col)
+    move = find_winning_move(own, opponent)
+    if move is not None:
+        return move
 
     # Step 2: Block opponent from winning
-    blocking_move = find_blocking_move(board, player)
-    if blocking_move:
-        row, col = blocking_move
-        return (row, col)
+    move = find_blocking_move(own, opponent)
+    if move is not None:
+        return move
 
     # Step 3: Block opponent's fork
-    blocking_fork_move = find_blocking_fork_move(board, player)
-    if blocking_fork_move:
-        row, col = blocking_fork_move
-        return (row, col)
+    move = find_blocking_fork_move(own, opponent)
+    if move is not None:
+        return move
 
     # Step 4: Try to create a fork
-    fork_move = find_fork_move(board, player)
-    if fork_move:
-        row, col = fork_move
-        return (row, col)
+    move = find_fork_move(own, opponent)
+    if move is not None:
+        return move
 
     # Step 5: Play strategically (e.g., pick center, then corners)
-    strategic_move = find_best_move(board)
-    if strategic_move:
-        row, col = strategic_move
-        return (row, col)
+    return find_best_move(own, opponent)
+
+
+class ComputerThinker:
+    """
+    Computes the computer moves in a background thread so the window keeps responding.
+
+    The chosen move is posted back to the event loop as an AI_MOVE_EVENT.
+    """
+
+    def __init__(self):
+        self.thread = None
+        self.cancel_event = threading.Event()
+        self.token = 0  # Identifies the current search, stale results are ignored
+        self.busy = False  # True from start() until the result is accepted or cancelled
+
+    def start(self, player):
+        """Starts searching a move for the player on a snapshot of the board."""
+        self.cancel()
+        self.token += 1
+        self.cancel_event = threading.Event()
+        self.busy = True
+        self.thread = threading.Thread(
+            target=self._search,
+            args=(board.copy(), player, self.token, self.cancel_event),
+            daemon=True,
+        )
+        self.thread.start()
+
+    def _search(self, snapshot, player, token, cancel_event):
+        """Worker thread body."""
+        if cancel_event.wait(AI_THINKING_DELAY):  # Add a delay for realism
+            return
+        move = computer_move(snapshot, player, cancel_event)
+        if move is None or cancel_event.is_set():
+            return
+        pygame.event.post(
+            pygame.event.Event(AI_MOVE_EVENT, row=move[0], col=move[1], token=token)
+        )
+
+    def accept(self, event):
+        """
+        Returns the (row, col) carried by an AI_MOVE_EVENT, None if it belongs to a cancelled search.
+        """
+        if not self.busy or event.token != self.token:
+            return None
+        self.busy = False
+        return (event.row, event.col)
+
+    def cancel(self):
+        """Cancels the running search and waits for the worker to stop."""
+        self.cancel_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.busy = False
+
+
+def draw_board():
+    """Draws the grid, the marks and the winning line if any."""
+    draw_lines()
+    draw_figures()
+    for mark in (1, 2):
+        check_win(mark)  # Draws the winning line if any
+
+
+def draw_thinking_indicator():
+    """Draws a small 'Thinking...' label while the computer searches its move."""
+    dots = "." * (pygame.time.get_ticks() // 300 % 4)
+    label = render_text(f"Thinking{dots}", SMALL_FONT, CROSS_COLOR)
+    # The label lies on the board: repaint the part of the board under it, clipped to its
+    # rectangle, before drawing the label over it
+    screen.set_clip(THINKING_RECT)
+    screen.fill(BG_COLOR)
+    draw_board()
+    screen.blit(label, (THINKING_RECT.x + 5, THINKING_RECT.y + 5))
+    screen.set_clip(None)
+
 
+def draw_frame(selecting_mode, thinking):
+    """
+    Repaints the whole window from the current state.
 
-def find_winning_move(board, player):
+    Parameters:
+        selecting_mode: True while the mode selection buttons are displayed.
+        thinking: True while the computer searches its move.
+    """
+    screen.fill(BG_COLOR)
+    if selecting_mode:
+        draw_buttons()
+        return
+
+    draw_board()
+    if thinking:
+        draw_thinking_indicator()
+
+
+def find_winning_move(own, opponent):
     """Finds a winning move for the computer player."""
-    for row in range(BOARD_ROWS):
-        for col in range(BOARD_COLS):
-            if board[row][col] == 0:
-                board[row][col] = player  # Simulate a move
-                if check_win(player, draw_winning_line=False):
-                    board[row][col] = 0
-                    return (row, col)
-                board[row][col] = 0
+    taken = own | opponent
+    for cell in range(9):
+        bit = 1 << cell
+        if not taken & bit and IS_WIN[own | bit]:  # Simulate a move
+            return cell
     return None
 
 
-def find_blocking_move(board, player):
+def find_blocking_move(own, opponent):
     """Finds a move that blocks the opponent from winning."""
-    for row in range(BOARD_ROWS):
-        for col in range(BOARD_COLS):
-            if board[row][col] == 0:
-                board[row][col] = 3 - player  # Simulate a move
-                if check_win(3 - player, draw_winning_line=False):
-                    board[row][col] = 0
-                    return (row, col)
-                board[row][col] = 0
+    return find_winning_move(opponent, own)
 
 
-def check_fork(player):
+def check_fork(own, opponent):
     """Checks if placing a mark creates a fork for the player."""
-    fork_count = 0
+    taken = own | opponent
+    for cell in range(9):
+        bit = 1 << cell
+        # A fork occurs if two or more winning lines are created
+        if not taken & bit and count_winning_lines(own | bit, opponent) > 1:
+            return True
+    return False
 
-    # Loop through all empty squares
-    for row in range(BOARD_ROWS):
-        for col in range(BOARD_COLS):
-            if board[row][col] == 0:  # If the square is empty
-                board[row][col] = player  # Simulate the move
-                winning_lines = count_winning_lines(
-                    board, player
-                )  # Count possible wins
-                if (
-                    winning_lines > 1
-                ):  # A fork occurs if two or more winning lines are created
-                    fork_count += 1
-                board[row][col] = 0  # Undo the move
-
-    return fork_count > 0
-
-
-def count_winning_lines(board, player):
-    """Counts the number of potential winning lines for the player."""
-    winning_lines = 0
 
-    # Check rows and columns
-    for i in range(BOARD_ROWS):
-        if np.sum(board[i, :] == player) == 2 and np.sum(board[i, :] == 0) == 1:
-            winning_lines += 1
-        if np.sum(board[:, i] == player) == 2 and np.sum(board[:, i] == 0) == 1:
+def count_winning_lines(own, opponent):
+    """Counts the lines holding two of the player's marks and an empty square."""
+    winning_lines = 0
+    for win in WIN_MASKS:
+        if not opponent & win and (own & win).bit_count() == 2:
             winning_lines += 1
-
-    # Check diagonals
-    main_diag = [board[i, i] for i in range(BOARD_ROWS)]
-    anti_diag = [board[i, BOARD_COLS - i - 1] for i in range(BOARD_ROWS)]
-    if (
-        np.sum(np.array(main_diag) == player) == 2
-        and np.sum(np.array(main_diag) == 0) == 1
-    ):
-        winning_lines += 1
-    if (
-        np.sum(np.array(anti_diag) == player) == 2
-        and np.sum(np.array(anti_diag) == 0) == 1
-    ):
-        winning_lines += 1
-
     return winning_lines
 
 
-def find_blocking_fork_move(board, player):
+def find_blocking_fork_move(own, opponent):
     """Finds a move that blocks the opponent's fork."""
-    for row in range(BOARD_ROWS):
-        for col in range(BOARD_COLS):
-            if board[row][col] == 0:
-                board[row][col] = 3 - player  # Simulate a move
-                if check_fork(3 - player):
-                    board[row][col] = 0
-                    return (row, col)
-                board[row][col] = 0
-    return None
+    return find_fork_move(opponent, own)
 
 
-def find_fork_move(board, player):
+def find_fork_move(own, opponent):
     """Finds a move that creates a fork for the computer player."""
-    for row in range(BOARD_ROWS):
-        for col in range(BOARD_COLS):
-            if board[row][col] == 0:
-                board[row][col] = player  # Simulate a move
-                if check_fork(player):
-                    board[row][col] = 0
-                    return (row, col)
-                board[row][col] = 0
+    taken = own | opponent
+    for cell in range(9):
+        bit = 1 << cell
+        if not taken & bit and check_fork(own | bit, opponent):  # Simulate a move
+            return cell
     return None
 
 
-def find_best_move(board):
+def find_best_move(own, opponent):
     """Finds the best move for the computer player."""
-    # Play center if available
-    if board[1][1] == 0:
-        return (1, 1)
-
-    # Play a corner if available
-    for move in [(0, 0), (0, 2), (2, 0), (2, 2)]:
-        if board[move[0]][move[1]] == 0:
-            return move
-
-    # Play a side if available
-    for move in [(0, 1), (1, 0), (1, 2), (2, 1)]:
-        if board[move[0]][move[1]] == 0:
-            return move
+    taken = own | opponent
+    for cell in STRATEGIC_CELLS:
+        if not taken & (1 << cell):
+            return cell
+    return None
 
 
-# Game loop
-draw_lines()
+def computer_to_play(selecting_mode):
+    """Checks if the computer has to find a move."""
+    return (
+        not selecting_mode
+        and game_mode == "computer"
+        and player == 2
+        and not is_board_full()
+    )
 
 
 def main():
     global player, running, game_mode
     running = True
     selecting_mode = True
+    needs_redraw = True
+    thinker = ComputerThinker()
+    clock = pygame.time.Clock()
 
     while running:
-        for event in pygame.event.get():
+        thinking = computer_to_play(selecting_mode)
+        if thinking:
+            if not thinker.busy:
+                thinker.start(player)
+            # The indicator is animated, wake up at a fixed frame rate
+            clock.tick(FPS)
+            events = pygame.event.get()
+        else:
+            # Nothing moves on screen, sleep until something happens
+            events = [pygame.event.wait()] + pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
-            if selecting_mode:
-                screen.fill(BG_COLOR)
-                human_button, computer_button = draw_buttons()
+            elif event.type in REDRAW_EVENTS:
+                needs_redraw = True
 
+            elif selecting_mode:
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     mouseX, mouseY = event.pos
-                    if human_button.collidepoint(mouseX, mouseY):
+                    if HUMAN_BUTTON.collidepoint(mouseX, mouseY):
                         game_mode = "human"
                         selecting_mode = False
-                        screen.fill(BG_COLOR)
-                        draw_lines()
-                    elif computer_button.collidepoint(mouseX, mouseY):
+                        needs_redraw = True
+                    elif COMPUTER_BUTTON.collidepoint(mouseX, mouseY):
                         game_mode = "computer"
                         selecting_mode = False
-                        screen.fill(BG_COLOR)
-                        draw_lines()
-
-            elif not selecting_mode:
-                if game_mode == "human":
-                    if event.type == pygame.MOUSEBUTTONDOWN and not is_board_full():
-                        mouseX = event.pos[0]  # X
-                        mouseY = event.pos[1]  # Y
-
-                        clicked_row = int(mouseY // (HEIGHT // 3))
-                        clicked_col = int(mouseX // (WIDTH // 3))
-
-                        if available_square(clicked_row, clicked_col):
-                            mark_square(clicked_row, clicked_col, player)
-                            if check_win(player):
-                                pass
-                            player = 3 - player  # Switch player
-
-                        draw_figures()
-
-                elif game_mode == "computer":
-                    if (
-                        player == 1
-                        and event.type == pygame.MOUSEBUTTONDOWN
-                        and not is_board_full()
-                    ):
-                        mouseX = event.pos[0]  # X
-                        mouseY = event.pos[1]  # Y
-
-                        clicked_row = int(mouseY // (HEIGHT // 3))
-                        clicked_col = int(mouseX // (WIDTH // 3))
-
-                        if available_square(clicked_row, clicked_col):
-                            mark_square(clicked_row, clicked_col, player)
-                            if check_win(player):
-                                pass
-                            player = 3 - player  # Switch player
-
-                        draw_figures()
-
-                    elif player == 2 and not is_board_full():
-                        pygame.time.wait(500)  # Add a delay for realism
-                        row, col = computer_move(player)
-                        mark_square(row, col, player)
-                        if check_win(player):
-                            pass
-                        player = 3 - player  # Switch player
-
-                        draw_figures()
-
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:  # Enter key to restart
-                        restart()
-                    elif event.key == pygame.K_BACKSPACE:  # Backspace key to quit
-                        pygame.quit()
-                        quit()
-
+                        needs_redraw = True
+
+            elif (
+                event.type == pygame.MOUSEBUTTONDOWN
+                and (game_mode == "human" or player == 1)
+                and not is_board_full()
+            ):
+                mouseX = event.pos[0]  # X
+                mouseY = event.pos[1]  # Y
+
+                clicked_row = int(mouseY // (HEIGHT // 3))
+                clicked_col = int(mouseX // (WIDTH // 3))
+
+                if available_square(clicked_row, clicked_col):
+                    mark_square(clicked_row, clicked_col, player)
+                    player = 3 - player  # Switch player
+                    needs_redraw = True
+
+            elif event.type == AI_MOVE_EVENT and computer_to_play(selecting_mode):
+                move = thinker.accept(event)
+                if move is not None:
+                    row, col = move
+                    mark_square(row, col, player)
+                    player = 3 - player  # Switch player
+                    needs_redraw = True
+
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN:  # Enter key to restart
+                    thinker.cancel()
+                    restart()
+                    needs_redraw = True
+                elif event.key == pygame.K_BACKSPACE:  # Backspace key to quit
+                    thinker.cancel()
+                    pygame.quit()
+                    quit()
+
+        if not running:
+            break
+
+        # One repaint per frame, whatever the number of events handled
+        thinking = computer_to_play(selecting_mode)
+        if needs_redraw:
+            draw_frame(selecting_mode, thinking)
             pygame.display.update()
+            needs_redraw = False
+        elif thinking:
+            draw_thinking_indicator()
+            pygame.display.update(THINKING_RECT)
+
+    thinker.cancel()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+"""
+Start-up benchmark of the game modules.
+
+Each module is imported in a fresh interpreter, from its own folder like when the game is launched,
+and the import time is compared to the baseline saved in startup_baseline.json. The benchmark fails
+(exit code 1) when a module gets slower than its baseline, or when it loads at import time one of
+the heavy libraries that should only be loaded by the code paths using them.
+
+Absolute times depend on the machine, so the import times are divided by the start-up time of an
+empty interpreter ('python -c pass') measured in the same run: the baseline holds these ratios,
+and one recorded on a machine can be checked on another.
+
+Usage:
+    python startup_benchmark.py             # Compares with the baseline
+    python startup_benchmark.py --update    # Saves the current times as the new baseline
+"""
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(ROOT, "startup_baseline.json")
+
+# (folder, module) of the game modules measured
+GAME_MODULES = (
+    ("Mastermind", "mastermind"),
+    ("Mastermind", "auto_mastermind"),
+    ("Hangman", "Hangman"),
+)
+HEAVY_MODULES = ("matplotlib", "numpy", "pandas")
+
+# Run in the child interpreter: times the import and lists the heavy modules it loaded
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print(json.dumps({{"time": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure_import(folder: str, module: str):
+    """
+    Imports a module in a new interpreter.
+
+    Returns:
+        dict: The import 'time' in seconds and the 'heavy' modules loaded.
+
+    Raises:
+        subprocess.CalledProcessError: If the import fails.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES),
+        ],
+        cwd=os.path.join(ROOT, folder),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def measure_reference():
+    """
+    Starts an empty interpreter, the unit of the import times.
+
+    Returns:
+        float: Its start-up time in seconds.
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - start
+
+
+def run_benchmark(repeats: int = 5):
+    """
+    Measures every game module, and the reference interpreter start-up between them so both see
+    the same load of the machine.
+
+    Parameters:
+        repeats: Number of imports per module, the fastest one is kept as the least noisy.
+
+    Returns:
+        tuple: The reference start-up time in seconds, and module -> {'time': seconds,
+            'ratio': time / reference, 'heavy': heavy modules loaded}.
+    """
+    references = []
+    runs = {f"{folder}/{module}": [] for folder, module in GAME_MODULES}
+    for _ in range(repeats):
+        references.append(measure_reference())
+        for folder, module in GAME_MODULES:
+            runs[f"{folder}/{module}"].append(measure_import(folder, module))
+
+    reference = min(references)
+    results = {}
+    for name, module_runs in runs.items():
+        elapsed = min(run["time"] for run in module_runs)
+        results[name] = {
+            "time": elapsed,
+            "ratio": elapsed / reference,
+            "heavy": module_runs[0]["heavy"],
+        }
+    return reference, results
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float, slack: float):
+    """
+    Compares the results with the baseline.
+
+    Parameters:
+        results: See run_benchmark.
+        baseline: module -> import time divided by the reference start-up time.
+        tolerance: Relative slowdown allowed, e.g. 0.5 for 50 %.
+        slack: Slowdown added to the relative one, as a fraction of the reference start-up
+            time, a small floor for the noise on very fast imports.
+
+    Returns:
+        list: The messages describing each regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        if result["heavy"]:
+            regressions.append(f"{name} loads {', '.join(result['heavy'])} at import")
+        if name in baseline:
+            limit = baseline[name] * (1 + tolerance) + slack
+            if result["ratio"] > limit:
+                regressions.append(
+                    f"{name} imports in {result['ratio']:.3f} start-ups, "
+                    f"limit {limit:.3f}"
+                )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measures the import time of the game modules."
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Imports per module.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="Relative slowdown allowed."
+    )
+    parser.add_argument(
+        "--slack",
+        type=float,
+        default=0.05,
+        help="Slowdown allowed on top of the tolerance, in reference start-ups.",
+    )
+    parser.add_argument(
+        "--update", action="store_true", help="Save the times as the new baseline."
+    )
+    args = parser.parse_args()
+
+    reference, results = run_benchmark(args.repeats)
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    print(f"🤖 : {'reference (python -c pass)':<28} {reference * 1000:7.1f} ms")
+    for name, result in results.items():
+        recorded = baseline.get(name)
+        recorded = f"{recorded:.3f}" if recorded is not None else "-"
+        print(
+            f"🤖 : {name:<28} {result['time'] * 1000:7.1f} ms, "
+            f"{result['ratio']:.3f} start-ups (baseline {recorded})"
+        )
+
+    if args.update:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({name: r["ratio"] for name, r in results.items()}, f, indent=4)
+        print(f"🤖 : Baseline saved to {BASELINE_PATH}.")
+        sys.exit(0)
+
+    regressions = find_regressions(results, baseline, args.tolerance, args.slack)
+    for message in regressions:
+        print(f"🤖 : Regression: {message}")
+    sys.exit(1 if regressions else 0)